@@ -560,13 +560,19 @@ When formulating responses:
 
         return ai_me
 
-    async def run(self, user_input: str, **runner_kwargs) -> str:
+    async def run(self, user_input: str, max_turns: int = 20, **runner_kwargs) -> str:
         """Run the agent and post-process output to remove Unicode brackets.
         
         Implements FR-001 (Chat Interface), FR-003 (First-Person Persona),
         FR-008 (Output Normalization), FR-012 (Tool Error Handling),
         NFR-001 (Sub-5s Response), NFR-003 (Structured Logging),
         NFR-004 (Unicode Normalization).
+        
+        Args:
+            user_input: The user's message
+            max_turns: Maximum agent turns (LLM calls) before giving up; more than the
+                SDK default of 10 to allow complex queries
+            **runner_kwargs: Extra keyword arguments passed to Runner.run
         """
         # Log user input with session context
         session_prefix = f"[Session: {self.session_id[:8]}...] " if self.session_id else ""
@@ -576,12 +582,11 @@ When formulating responses:
         run_config = RunConfig(tracing_disabled=True)
 
         try:
-            # Allow more turns for complex queries (default is 10)
             result: RunResult = await Runner.run(
                 self._agent, 
                 user_input, 
                 run_config=run_config,
-                max_turns=20,
+                max_turns=max_turns,
                 **runner_kwargs
             )
         except Exception as e:
@@ -12,8 +12,15 @@ logger = setup_logger(__name__)
 config = Config() # type: ignore
 
 # Initialize data manager and vectorstore
-data_config = DataManagerConfig()
+data_config = DataManagerConfig(
+    embedding_backend=config.embedding_backend,
+    embedding_onnx_file=config.embedding_onnx_file,
+    infinity_api_url=config.infinity_api_url,
+    embedding_cache_dir=config.embedding_cache_dir,
+    persist_dir=config.persist_dir,
+)
 data_manager = DataManager(config=data_config)
+# A persisted vectorstore is only rebuilt when the loaded content has changed
 vectorstore = data_manager.setup_vectorstore(github_repos=config.github_repos)  # type: ignore
 
 # Per-session agent storage (keyed by Gradio session_hash)
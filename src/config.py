@@ -6,8 +6,8 @@ import logging
 import os
 import socket
 from logging.handlers import QueueHandler, QueueListener
-from queue import Queue
-from typing import Optional, List, Union
+from queue import Empty, Full, Queue
+from typing import ClassVar, FrozenSet, Literal, Optional, List, Union
 
 from pydantic import Field, field_validator, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,8 +16,55 @@ from agents import set_default_openai_client, set_tracing_export_api_key
 from logging_loki import LokiHandler
 from dotenv import load_dotenv
 
+# Environment marker recording that .env has already been loaded in this process tree
+_DOTENV_LOADED_ENV = "_AI_ME_DOTENV_LOADED"
+
+
+def load_env(force: bool = False) -> None:
+    """
+    Load the .env file once per process.
+    
+    Re-importing this module (multi-process workers, reloads) would otherwise re-read and
+    re-parse .env every time. The marker lives in os.environ so child processes inherit it.
+    
+    Args:
+        force: If True, reload .env even if it was already loaded (useful for tests)
+    """
+    if force or not os.environ.get(_DOTENV_LOADED_ENV):
+        load_dotenv()
+        os.environ[_DOTENV_LOADED_ENV] = "1"
+
+
 # Load .env file early so logger setup can access environment variables
-load_dotenv()
+load_env()
+
+
+class SilentLokiHandler(LokiHandler):
+    """LokiHandler that swallows emit errors to prevent logging loops."""
+    
+    def handleError(self, record: logging.LogRecord) -> None:
+        return None
+
+
+class DropOldestQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue that never blocks the logging thread: when the queue
+    is full (e.g., Loki is slow or down), the oldest queued record is dropped to make room.
+    """
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            except Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except Full:
+                pass  # Refilled by other threads meanwhile; drop this record instead
 
 
 def setup_logger(name: str) -> logging.Logger:
@@ -79,7 +126,8 @@ def setup_logger(name: str) -> logging.Logger:
         
         if loki_url and loki_username and loki_password:  # pragma: no cover
             try:
-                # Create async queue for non-blocking logging
+                # Create async queue for non-blocking logging, bounded so a stalled Loki
+                # can't grow memory without limit
                 log_queue = Queue(maxsize=1000)  # Buffer up to 1000 log messages
                 
                 # Loki handler processes logs from queue in background thread
@@ -87,14 +135,13 @@ def setup_logger(name: str) -> logging.Logger:
                     "application": "ai-me",
                     "environment": os.getenv('ENV', 'production'),
                 }
-                loki_handler = LokiHandler(
+                # SilentLokiHandler prevents Loki errors from propagating and causing logging loops
+                loki_handler = SilentLokiHandler(
                     url=f"{loki_url}/loki/api/v1/push",
                     tags=loki_tags,
                     auth=(loki_username, loki_password),
                     version="1",
                 )
-                # Prevent Loki errors from propagating and causing logging loops
-                loki_handler.handleError = lambda record: None
                 
                 # QueueListener processes logs asynchronously in background
                 queue_listener = QueueListener(
@@ -104,8 +151,8 @@ def setup_logger(name: str) -> logging.Logger:
                 )
                 queue_listener.start()
                 
-                # QueueHandler sends logs to queue without blocking
-                queue_handler = QueueHandler(log_queue)
+                # Sends logs to queue without blocking, dropping the oldest when it is full
+                queue_handler = DropOldestQueueHandler(log_queue)
                 root_logger.addHandler(queue_handler)
                 
                 root_logger.info(f"Grafana Loki logging enabled: {loki_url} (tags: {loki_tags})")
@@ -145,6 +192,9 @@ class Config(BaseSettings):
     model: str = Field(
         default="openai/openai/gpt-oss-120b",
         description="LLM model identifier")
+    llm_base_url: str = Field(
+        default="https://api.groq.com/openai/v1",
+        description="OpenAI-compatible inference endpoint (Groq by default)")
     temperature: float = Field(
         default=1.0,
         description="LLM temperature for sampling (0.0-2.0, default 1.0)")
@@ -154,6 +204,21 @@ class Config(BaseSettings):
     github_repos: Union[str, List[str]] = Field(
         default="",
         description="GitHub repos to load (format: owner/repo), comma-separated in .env")
+    embedding_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for cached chunk embeddings (optional, disabled if unset)")
+    embedding_backend: Literal["hf", "fastembed", "infinity"] = Field(
+        default="hf",
+        description="Embedding provider: hf (sentence-transformers), fastembed, or infinity")
+    embedding_onnx_file: Optional[str] = Field(
+        default=None,
+        description="ONNX model file to run with the hf backend, e.g. an int8-quantized export")
+    infinity_api_url: str = Field(
+        default="http://localhost:7997",
+        description="Infinity embedding server URL (only used by the infinity backend)")
+    persist_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for a persistent vectorstore reused across restarts (optional)")
     
     @field_validator("github_repos", mode="after")
     @classmethod
@@ -185,38 +250,45 @@ class Config(BaseSettings):
         # This ensures GitHub Actions and other CI environments work
     )
     
+    # Field names resolved once after class creation (see below) for _safe_repr
+    _FIELD_NAMES: ClassVar[FrozenSet[str]] = frozenset()
+    
     def model_post_init(self, __context) -> None:
         """Initialize after Pydantic validation."""
         # Set tokenizer parallelism
         os.environ["TOKENIZERS_PARALLELISM"] = "false"
         
-        # Initialize Groq client for LLM operations
-        default_query = {"temperature": self.temperature}
-        if self.seed is not None:
-            default_query["seed"] = self.seed
-        
-        self.openai_client = AsyncOpenAI(
-            base_url="https://api.groq.com/openai/v1",
-            api_key=self.groq_api_key.get_secret_value(),
-            default_query=default_query
-        )
+        # Initialize Groq client for LLM operations, reusing an existing client (and its
+        # connection pool) if one was supplied, e.g. when a Config is rebuilt
+        if self.openai_client is None:
+            default_query = {"temperature": self.temperature}
+            if self.seed is not None:
+                default_query["seed"] = self.seed
+            
+            self.openai_client = AsyncOpenAI(
+                base_url=self.llm_base_url,
+                api_key=self.groq_api_key.get_secret_value(),
+                default_query=default_query
+            )
         set_default_openai_client(self.openai_client)
         
         # Set tracing API key AFTER setting default client (if provided)
         if self.openai_api_key:
-            logger.info("Setting tracing export API key for agents.")
+            logger.debug("Setting tracing export API key for agents.")
             set_tracing_export_api_key(self.openai_api_key.get_secret_value())
         else:
             logger.info("No OpenAI API key provided, tracing disabled.")
     
     def _safe_repr(self) -> str:  # pragma: no cover
         """Helper to generate string representation excluding sensitive fields."""
+        # Read field values straight from __dict__ to skip per-field attribute lookups
+        fields = self._FIELD_NAMES
         lines = ["Config:"]
-        for field_name in type(self).model_fields:
-            value = getattr(self, field_name, None)
-            # Check if the actual value is a SecretStr instance
-            display = "<hidden>" if isinstance(value, SecretStr) else repr(value)
-            lines.append(f"  {field_name}: {display}")
+        lines.extend(
+            f"  {name}: {'<hidden>' if isinstance(value, SecretStr) else repr(value)}"
+            for name, value in self.__dict__.items()
+            if name in fields
+        )
         return "\n".join(lines)
     
     def __repr__(self) -> str:  # pragma: no cover
@@ -232,3 +304,7 @@ class Config(BaseSettings):
         DEBUG: Debug utility for logging/debugging configuration state.
         """
         return self._safe_repr()
+
+
+# Resolve model field names once instead of on every repr/str call
+Config._FIELD_NAMES = frozenset(Config.model_fields)
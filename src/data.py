@@ -2,20 +2,31 @@
 Document loading, processing, and vectorstore management for ai-me application. Handles loading
 from local directories and GitHub repositories, chunking, and creating ChromaDB vector stores.
 """
+import atexit
+import collections
+import fnmatch
+import functools
+import glob
+import hashlib
+import itertools
+import logging
 import os
 import re
 import shutil
+import sys
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Callable
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Literal, Optional, Callable, Tuple
 
+from git import Repo as GitRepo
 from pydantic import BaseModel, Field
-from langchain_community.document_loaders import (
-    DirectoryLoader,
-    TextLoader,
-    GitLoader,
-)
 from langchain_text_splitters import MarkdownTextSplitter, MarkdownHeaderTextSplitter
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 import chromadb
@@ -23,8 +34,212 @@ from chromadb.config import Settings
 
 from config import setup_logger
 
+if TYPE_CHECKING:
+    import torch
+
 logger = setup_logger(__name__)
 
+# Baseless absolute paths like /website/ or /docs/ at the start or after whitespace, typically
+# used in short links. Checking the preceding character with a lookbehind instead of
+# capturing it makes each scan noticeably cheaper.
+_ABS_PATH_RE = re.compile(r'(?<!\S)(/[a-zA-Z0-9_-]+/)')
+# Inline markdown links to repo-relative markdown files like [text](/path/file.md#anchor)
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\((/[^)]+\.md(?:#[^)]+)?)\)')
+
+# Loaded embedding models shared by every DataManager in the process, keyed by backend plus
+# the settings that affect the loaded model, so weights are only loaded once
+_MODEL_CACHE: Dict[Tuple, Embeddings] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# Version of the per-chunk metadata layout, stored on each collection (1: chunks carry a
+# 'basename' key). Part of the collection fingerprint, so older collections are rebuilt.
+_CHUNK_METADATA_VERSION = 1
+
+# Common boilerplate that doesn't represent the agent's knowledge
+_EXCLUDED_BASENAMES = frozenset(
+    {"readme.md", "contributing.md", "code_of_conduct.md", "security.md"}
+)
+
+def _default_file_filter(fp: str) -> bool:
+    """Default filter excludes contributing docs to preserve RAG quality.
+    
+    Implements FR-002 (Knowledge Retrieval): Filters out common boilerplate
+    files (README, CONTRIBUTING, etc.) that aren't representative of
+    personified agent knowledge.
+    """
+    return os.path.basename(fp).lower() not in _EXCLUDED_BASENAMES
+
+def _find_files(root: str, pattern: str) -> List[str]:
+    """
+    Return sorted paths of files under root matching a glob pattern. Patterns of the form
+    '*.md' or '**/*.md' are matched with a single os.scandir walk (skipping hidden entries,
+    like glob does); anything more complex falls back to glob.glob. Directories that can't
+    be read (or a root that isn't a directory) are logged and skipped.
+    """
+    recursive = pattern.startswith("**/")
+    name_pattern = pattern[3:] if recursive else pattern
+    if "/" in name_pattern or "**" in name_pattern:
+        matches = glob.glob(os.path.join(root, pattern), recursive=True)
+        return sorted(path for path in matches if os.path.isfile(path))
+    
+    matches = []
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif fnmatch.fnmatchcase(entry.name, name_pattern):
+                        matches.append(entry.path)
+        except OSError as e:
+            logger.warning(f"Skipping unreadable directory {directory}: {e}")
+    return sorted(matches)
+
+@functools.lru_cache(maxsize=None)
+def _get_splitters(chunk_size: int) -> Tuple[MarkdownHeaderTextSplitter, MarkdownTextSplitter]:
+    """
+    Return the (header, size) splitter pair for a chunk size. Splitters are stateless, so each
+    process builds them (and their separator patterns) once.
+    """
+    header_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=[("#", "H1"), ("##", "H2"), ("###", "H3")],
+        strip_headers=False,
+    )
+    return header_splitter, MarkdownTextSplitter(chunk_size=chunk_size)
+
+def _upcast_token_embeddings(module, inputs, features: Dict) -> None:
+    """
+    Forward hook for a half-precision sentence-transformers Transformer module: casts its
+    token embeddings to fp32 so pooling and normalization run at full precision.
+    """
+    features["token_embeddings"] = features["token_embeddings"].float()
+
+def _intern_values(metadata: Dict) -> Dict:
+    """Return a copy of metadata with its string values interned."""
+    return {
+        key: sys.intern(value) if isinstance(value, str) else value
+        for key, value in metadata.items()
+    }
+
+def _split_document(doc: Document, chunk_size: int) -> List[Document]:
+    """
+    Split one document by headers, then size-split only the sections that exceed chunk_size.
+    Module-level so it can run in a process pool; chunk_index is assigned by the caller.
+    """
+    header_splitter, size_splitter = _get_splitters(chunk_size)
+    # Metadata strings (repo, headers, basenames) repeat across many chunks, so intern them
+    # and let every chunk reference one shared copy
+    doc_metadata = _intern_values(doc.metadata)
+    # Stored so chunks can be looked up by file with a metadata filter
+    basename = sys.intern(os.path.basename(doc.metadata.get("source", "")))
+    
+    pieces = []
+    # Split by headers first - this returns Documents with header metadata
+    for section in header_splitter.split_text(doc.page_content):
+        # Preserve original metadata + add header metadata
+        metadata = doc_metadata | _intern_values(section.metadata)
+        metadata["basename"] = basename
+
+        if len(section.page_content) <= chunk_size:
+            # The merged dict is fresh for this section, so a single piece can own it
+            pieces.append(Document(page_content=section.page_content, metadata=metadata))
+            continue
+        # Each piece gets its own metadata dict since chunk_index is set on it later
+        pieces.extend(
+            Document(page_content=text, metadata=dict(metadata))
+            for text in size_splitter.split_text(section.page_content)
+        )
+    return pieces
+
+def _content_fingerprint(chunks: List[Document], *settings: object) -> str:
+    """
+    Return an md5 over the given settings (e.g., model identity and index parameters) and the
+    sorted (source, content hash) pairs of all chunks. Any change to the docs, the chunking,
+    or the settings changes the fingerprint.
+    """
+    pairs = sorted(
+        (
+            chunk.metadata.get("source", ""),
+            hashlib.sha256(chunk.page_content.encode()).hexdigest(),
+        )
+        for chunk in chunks
+    )
+    digest = hashlib.md5(repr(settings).encode())
+    for source, content_hash in pairs:
+        digest.update(f"\0{source}\0{content_hash}".encode())
+    return digest.hexdigest()
+
+class QueryCachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that memoizes embed_query in an LRU cache. Repeated retrieval queries
+    skip the encoder entirely; document embedding is passed straight through.
+    """
+    
+    def __init__(self, underlying: Embeddings, maxsize: int = 1000):
+        self.underlying = underlying
+        self._cached_query = functools.lru_cache(maxsize=maxsize)(self._embed_query)
+    
+    def _embed_query(self, text: str) -> Tuple[float, ...]:
+        # Stored as a tuple so callers can't mutate the cached vector
+        return tuple(self.underlying.embed_query(text))
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.underlying.embed_documents(texts)
+    
+    def embed_query(self, text: str) -> List[float]:
+        return list(self._cached_query(text))
+    
+    def cache_info(self) -> functools._CacheInfo:
+        """Return hit/miss statistics for the query cache."""
+        return self._cached_query.cache_info()
+
+class PooledDocumentEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that shards embed_documents across a sentence-transformers
+    multi-process pool (one worker per GPU). The pool is started on first use and kept
+    across calls until close(); queries are encoded in-process, since one short text isn't
+    worth a round trip through the pool.
+    """
+
+    def __init__(self, underlying: HuggingFaceEmbeddings, batch_size: int):
+        self.underlying = underlying
+        self.batch_size = batch_size
+        self._pool: Optional[Dict] = None
+        self._pool_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        client = self.underlying._client
+        with self._pool_lock:
+            if self._pool is None:
+                logger.info("Starting multi-process embedding pool")
+                self._pool = client.start_multi_process_pool()
+                # Don't leave worker processes behind if the caller never closes the pool
+                atexit.register(self.close)
+            # Same newline handling as HuggingFaceEmbeddings.embed_documents
+            vectors = client.encode(
+                [text.replace("\n", " ") for text in texts],
+                pool=self._pool,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+            )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    def close(self) -> None:
+        """Stop the worker pool, if running; the next embed_documents starts a new one."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self.underlying._client.stop_multi_process_pool(self._pool)
+                self._pool = None
+                atexit.unregister(self.close)
+
 class DataManagerConfig(BaseModel):
     """Configuration for DataManager with Pydantic validation."""
     
@@ -48,8 +263,52 @@ class DataManagerConfig(BaseModel):
     embedding_model: str = Field(
         default="sentence-transformers/all-MiniLM-L6-v2",
         description="HuggingFace embedding model name")
+    embedding_backend: Literal["hf", "fastembed", "infinity"] = Field(
+        default="hf",
+        description="Embedding provider: sentence-transformers ('hf'), FastEmbed ONNX "
+                    "('fastembed', needs the fastembed package), or an Infinity server")
+    infinity_api_url: str = Field(
+        default="http://localhost:7997",
+        description="Infinity embedding server URL (used when embedding_backend='infinity')")
+    embedding_device: Optional[str] = Field(
+        default="auto",
+        description="Torch device for embeddings (e.g., 'cpu', 'cuda', 'mps') or 'auto'")
+    embedding_onnx_file: Optional[str] = Field(
+        default=None,
+        description="ONNX file in the model repo to run via onnxruntime instead of PyTorch, "
+                    "e.g. 'onnx/model_qint8_avx512_vnni.onnx' (needs the onnx extra)")
+    embedding_batch_size: Optional[int] = Field(
+        default=None,
+        description="Embedding encode batch size; defaults to 256 on GPU and 128 on CPU")
+    embedding_multi_process: bool = Field(
+        default=False,
+        description="Shard document embedding across all GPUs with a sentence-transformers pool")
+    embedding_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for a content-addressed embedding cache (disabled if None)")
+    query_cache_size: int = Field(
+        default=1000, description="Max query embeddings kept in the LRU cache (0 disables)")
     db_name: str = Field(
         default="ai_me", description="ChromaDB collection name")
+    persist_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for a persistent ChromaDB store (in-memory if None)")
+    hnsw_space: str = Field(
+        default="cosine", description="HNSW distance metric (cosine, l2, or ip)")
+    hnsw_construction_ef: int = Field(
+        default=200, description="HNSW candidate list size during index construction")
+    hnsw_search_ef: int = Field(
+        default=100, description="HNSW candidate list size during search")
+    hnsw_m: int = Field(
+        default=16, description="HNSW max neighbors per node")
+    insert_batch_size: int = Field(
+        default=512, description="Chunks embedded and inserted into ChromaDB per batch")
+    max_workers: Optional[int] = Field(
+        default=None,
+        description="Thread pool size for I/O-bound loading (None uses the executor default)")
+    chunk_processes: int = Field(
+        default=1,
+        description="Worker processes for chunking (1 splits in-process; 0 uses all CPUs)")
 
 class DataManager:
     """
@@ -71,7 +330,8 @@ class DataManager:
         
         # Internal state
         self.vectorstore: Optional[Chroma] = None
-        self._embeddings: Optional[HuggingFaceEmbeddings] = None
+        self._embeddings: Optional[Embeddings] = None
+        self._model: Optional[Embeddings] = None  # Loaded model, before any cache wrappers
     
     def load_local_documents(self) -> List[Document]:
         """
@@ -89,36 +349,54 @@ class DataManager:
             )
             return []
         
-        all_documents = []
-        
-        # Iterate over all glob patterns
+        # Enumerate files across all glob patterns once, de-duplicating overlapping matches
+        file_paths = []
+        seen = set()
         for pattern in self.config.doc_load_local:
-            try:
-                logger.info(f"  Loading pattern: {pattern}")
-                loader = DirectoryLoader(
-                    self.config.doc_root,
-                    glob=pattern,
-                    loader_cls=TextLoader,
-                    loader_kwargs={'encoding': 'utf-8'}
-                )
-                documents = loader.load()
-                logger.info(f"    Found {len(documents)} documents")
-                all_documents.extend(documents)
-            except Exception as e:  # pragma: no cover
-                logger.info(
-                    f"  Error loading pattern {pattern}: {e}"
-                    f" - skipping this pattern"
-                )
-                continue
+            logger.debug(f"  Loading pattern: {pattern}")
+            matches = _find_files(self.config.doc_root, pattern)
+            logger.debug(f"    Found {len(matches)} documents")
+            for path in matches:
+                if path not in seen:
+                    seen.add(path)
+                    file_paths.append(path)
+        
+        all_documents = self._load_files(file_paths)
         
         logger.info(f"Loaded {len(all_documents)} total local documents.")
         return all_documents
     
+    def _load_files(
+        self, file_paths: List[str], metadata: Optional[Dict] = None
+    ) -> List[Document]:
+        """
+        Load text files in a thread pool (file reads are I/O-bound), preserving order. Any
+        extra metadata is added to each document as it is created.
+        """
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            results = executor.map(
+                self._load_text_file, file_paths, itertools.repeat(metadata)
+            )
+            return [doc for docs in results for doc in docs]
+    
+    @staticmethod
+    def _load_text_file(path: str, metadata: Optional[Dict] = None) -> List[Document]:
+        """Load a single UTF-8 text file, returning an empty list if it can't be read."""
+        try:
+            # Read the whole file in one call and decode once, skipping TextLoader's
+            # per-file loader machinery
+            with open(path, "rb") as f:
+                text = f.read().decode("utf-8")
+            return [Document(page_content=text, metadata={"source": path, **(metadata or {})})]
+        except Exception as e:  # pragma: no cover
+            logger.info(f"  Error loading file {path}: {e} - skipping this file")
+            return []
+    
     def _load_github_documents(
         self,
         repos: Optional[List[str]] = None,
         file_filter: Optional[Callable[[str], bool]] = None,
-        cleanup_tmp: bool = True
+        cleanup_tmp: bool = False
     ) -> List[Document]:
         """
         Load documents from GitHub repositories.
@@ -129,7 +407,8 @@ class DataManager:
             repos: List of repos (owner/repo format). Defaults to github_repos from init.
             file_filter: Optional filter function for files. If None, uses default filter
                 excluding README, CONTRIBUTING, CODE_OF_CONDUCT, and SECURITY files.
-            cleanup_tmp: If True, remove tmp directory before loading.
+            cleanup_tmp: If True, remove tmp directory before loading. Otherwise existing
+                clones are updated in place, which is much cheaper than re-cloning.
         
         Returns:
             List of loaded documents from all repos.
@@ -137,19 +416,7 @@ class DataManager:
         
         # Default filter excludes common documentation files that degrade RAG quality
         if file_filter is None:
-            def default_file_filter(fp: str) -> bool:
-                """Default filter excludes contributing docs to preserve RAG quality.
-                
-                Implements FR-002 (Knowledge Retrieval): Filters out common boilerplate
-                files (README, CONTRIBUTING, etc.) that aren't representative of
-                personified agent knowledge.
-                """
-                basename = os.path.basename(fp).lower()
-                # Exclude common boilerplate that doesn't represent agent's knowledge
-                excluded = {"readme.md", "contributing.md", "code_of_conduct.md",
-                           "security.md"}
-                return basename not in excluded
-            file_filter = default_file_filter
+            file_filter = _default_file_filter
         
         all_docs = []
         # Use absolute path for tmp directory to avoid permission issues
@@ -167,48 +434,85 @@ class DataManager:
         # Use provided repos or default to empty list if none specified
         repos_to_load = repos if repos is not None else []
         logger.info(f"Loading GitHub documents from {len(repos_to_load)} repos {repos_to_load}")
-        for repo in repos_to_load:
-            logger.info(f"Loading GitHub repo: {repo}")
-            try:
-                # Clone repo using GitLoader (even though it doesn't load files)
-                repo_path = f"{tmp_dir}/{repo}"
-                loader = GitLoader(
-                    clone_url=f"https://github.com/{repo}",
-                    repo_path=repo_path,
-                    branch="main",
-                )
-                # GitLoader.load() doesn't return files, but it clones the repo
-                # so we use DirectoryLoader to actually load the markdown files
-                loader.load()
-                
-                # Now use DirectoryLoader to load markdown files from the cloned repo
-                directory_loader = DirectoryLoader(
-                    repo_path,
-                    glob="**/*.md",
-                    loader_cls=TextLoader,
-                    loader_kwargs={'encoding': 'utf-8'}
+        if repos_to_load:
+            # Clones are network-bound, so run them concurrently (capped to avoid rate limits)
+            max_workers = min(len(repos_to_load), self.config.max_workers or 8)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(
+                    lambda repo: self._load_github_repo(repo, tmp_dir, file_filter),
+                    repos_to_load,
                 )
-                docs = directory_loader.load()
-                
-                # Apply filter (default or custom) to exclude irrelevant files
-                docs = [doc for doc in docs if file_filter(doc.metadata['source'])]
-                
-                # Add repo metadata to each document
-                for doc in docs:
-                    doc.metadata["github_repo"] = repo
-                
-                logger.info(f"  Loaded {len(docs)} documents from {repo}")
-                all_docs.extend(docs) 
-            except Exception as e: # pragma: no cover
-                logger.info(f"  Error loading repo {repo}: {e} - skipping")
-                continue
+                all_docs = [doc for docs in results for doc in docs]
         
         logger.info(f"Loaded {len(all_docs)} total GitHub documents.")
         return all_docs
     
+    def _load_github_repo(
+        self, repo: str, tmp_dir: str, file_filter: Callable[[str], bool]
+    ) -> List[Document]:
+        """
+        Clone a single GitHub repo and load its markdown files. Returns empty list on failure.
+        
+        Implements FR-002 (Knowledge Retrieval), FR-010 (Optional Tools - GitHub).
+        
+        Args:
+            repo: Repo to load (owner/repo format)
+            tmp_dir: Directory the repo is cloned under
+            file_filter: Filter function applied to each file's source path
+        
+        Returns:
+            List of loaded documents tagged with github_repo metadata.
+        """
+        logger.info(f"Loading GitHub repo: {repo}")
+        try:
+            repo_path = f"{tmp_dir}/{repo}"
+            git_dir = os.path.join(repo_path, ".git")
+            
+            # Reuse an existing clone: a no-change fetch is near-free compared to a clone
+            if os.path.isdir(git_dir):
+                try:
+                    existing = GitRepo(repo_path)
+                    existing.git.fetch("--depth=1", "origin", "main")
+                    existing.git.reset("--hard", "origin/main")
+                    logger.info(f"  Updated existing clone of {repo}")
+                except Exception as e:
+                    logger.warning(f"  Could not update clone of {repo}: {e} - re-cloning")
+                    shutil.rmtree(repo_path, ignore_errors=True)
+            
+            if not os.path.isdir(git_dir):
+                # Shallow, single-branch, blobless clone: we only need the current markdown
+                # files, not the repo history or any other file contents
+                cloned = GitRepo.clone_from(
+                    f"https://github.com/{repo}",
+                    repo_path,
+                    depth=1,
+                    single_branch=True,
+                    branch="main",
+                    filter="blob:none",
+                    no_checkout=True,
+                )
+                # Check out markdown only, so just those blobs are downloaded (later fetch
+                # and reset updates keep the same sparse pattern)
+                cloned.git.sparse_checkout("set", "--no-cone", "*.md")
+                cloned.git.checkout("main")
+            
+            # Apply the filter (default or custom) to paths before reading, so excluded files
+            # are never loaded, and tag each document with its repo as it is created
+            file_paths = [
+                path for path in _find_files(repo_path, "**/*.md") if file_filter(path)
+            ]
+            docs = self._load_files(file_paths, metadata={"github_repo": repo})
+            
+            logger.info(f"  Loaded {len(docs)} documents from {repo}")
+            return docs
+        except Exception as e: # pragma: no cover
+            logger.info(f"  Error loading repo {repo}: {e} - skipping")
+            return []
+    
     def process_documents(self, docs: List[Document]) -> List[Document]:
         """
-        Hydrate links in markdown documents to point to GitHub.
+        Hydrate links in markdown documents to point to GitHub. Documents are updated in place
+        and the same list is returned.
         
         Implements FR-004 (Source Attribution).
         
@@ -216,26 +520,40 @@ class DataManager:
             docs: List of documents to process
         
         Returns:
-            List of processed documents
+            The processed documents (the input list)
         """
-        processed = []
+        # Replacement templates built once per repo rather than once per document
+        replacements: Dict[str, Tuple[str, str]] = {}
+        # Checked once so the per-document message isn't even formatted unless DEBUG is on
+        debug = logger.isEnabledFor(logging.DEBUG)
         for doc in docs:
-            logger.info(f"Processing: {doc.metadata['source']}")
+            # Only docs from a GitHub repo have baseless links to fix
+            repo = doc.metadata.get("github_repo")
+            if repo is None:
+                continue
+            if debug:
+                logger.debug(f"Processing: {doc.metadata['source']}")
+            
+            if repo not in replacements:
+                replacements[repo] = (
+                    rf'https://github.com/{repo}/tree/main\1',
+                    rf'[\1](https://github.com/{repo}/blob/main\2)',
+                )
+            tree_repl, blob_repl = replacements[repo]
             
-            # Fix baseless links to point to GitHub (if from a GitHub repo)
-            if "github_repo" in doc.metadata:
-                repo = doc.metadata["github_repo"]
+            content = doc.page_content
+            # Both patterns need a leading slash, so skip the regexes when there is none
+            if "/" in content:
                 # First pass: fix absolute paths like /website/ or /docs/
                 # typically used in short links
-                doc.page_content = re.sub(r'(\s|^)(/[a-zA-Z0-9_-]+/)',
-                    rf'\1https://github.com/{repo}/tree/main\2', doc.page_content)
+                content = _ABS_PATH_RE.sub(tree_repl, content)
                 # Second pass: fix inline markdown links like [text](/path/file.md)
-                doc.page_content = re.sub(r'\[([^\]]+)\]\((/[^)]+\.md(?:#[^)]+)?)\)',
-                    rf'[\1](https://github.com/{repo}/blob/main\2)', doc.page_content)
-                            
-            processed.append(doc)
+                if "](/" in content:
+                    content = _MD_LINK_RE.sub(blob_repl, content)
+                doc.page_content = content
         
-        return processed
+        logger.info(f"Processed {len(docs)} documents")
+        return docs
     
     def chunk_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -251,41 +569,37 @@ class DataManager:
             List of chunked documents with both original metadata and header metadata
         """
         logger.info(f"Chunking {len(documents)} documents...")
-        
-        # Define headers to split on (h1, h2, h3)
-        headers_to_split_on = [("#", "H1"), ("##", "H2"), ("###", "H3")]
-        header_splitter = MarkdownHeaderTextSplitter(headers_to_split_on=headers_to_split_on, 
-            strip_headers=False)
-        
-        all_chunks = []
-        chunk_index = 0  # Track chunk number across all documents
-        for doc in documents:
-            # Split by headers first - this returns Documents with header metadata
-            header_chunks = header_splitter.split_text(doc.page_content)
-            
-            # Convert to Documents and preserve original metadata + add header metadata
-            for chunk in header_chunks:
-                # Create new Document with combined metadata
-                merged_metadata = {**doc.metadata, **chunk.metadata}
-                merged_metadata['chunk_index'] = chunk_index  # Add global chunk index
-                chunk_index += 1
-                new_doc = Document(
-                    page_content=chunk.page_content,
-                    metadata=merged_metadata,
-                )
-                all_chunks.append(new_doc)
-        
-        # Optional: Further split large chunks if they exceed size limit
-        size_splitter = MarkdownTextSplitter(chunk_size=self.config.chunk_size)
-        final_chunks = size_splitter.split_documents(all_chunks)
-        
-        # Re-index after size splitting to maintain sequential chunk indices
-        for i, chunk in enumerate(final_chunks):
-            chunk.metadata['chunk_index'] = i
-        
+        final_chunks = list(self._iter_chunks(documents))
         logger.info(f"Created {len(final_chunks)} chunks")
         return final_chunks
     
+    def _iter_chunks(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Yield chunks one at a time in document order. Splitting is pure-Python regex work, so
+        with chunk_processes != 1 documents are split across a process pool. chunk_index is
+        assigned here as each chunk is emitted, keeping it sequential either way.
+        """
+        chunk_size = self.config.chunk_size
+        chunk_index = 0  # Track chunk number across all documents
+        
+        if self.config.chunk_processes == 1:
+            split_docs = (_split_document(doc, chunk_size) for doc in documents)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.config.chunk_processes or None)
+            split_docs = executor.map(
+                _split_document, documents, itertools.repeat(chunk_size), chunksize=16)
+        
+        try:
+            for pieces in split_docs:
+                for piece in pieces:
+                    piece.metadata["chunk_index"] = chunk_index
+                    chunk_index += 1
+                    yield piece
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+    
     def load_and_process_all(self, github_repos: Optional[List[str]] = None) -> List[Document]:
         """
         Load, process, and chunk all documents. Automatically loads local documents
@@ -302,35 +616,169 @@ class DataManager:
             List of processed and chunked documents.
         """
         all_docs = []
-        
-        # Load local documents if patterns are configured
-        if self.config.doc_load_local:
-            all_docs.extend(self.load_local_documents())
-        
-        # Load GitHub documents if repos are provided (github_repos must come from caller)
-        if github_repos:
-            all_docs.extend(self._load_github_documents(repos=github_repos))
-        
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Load GitHub documents if repos are provided (github_repos must come from caller).
+            # Cloning is network-bound, so it runs in the background while local docs load.
+            github_future = (
+                executor.submit(self._load_github_documents, repos=github_repos)
+                if github_repos else None
+            )
+
+            # Load local documents if patterns are configured
+            if self.config.doc_load_local:
+                all_docs.extend(self.load_local_documents())
+
+            # Local docs stay first so chunk order and indices are unchanged
+            if github_future is not None:
+                all_docs.extend(github_future.result())
+
         processed_docs = self.process_documents(all_docs)
         chunks = self.chunk_documents(processed_docs)
         
         return chunks
     
-    def get_embeddings(self) -> HuggingFaceEmbeddings:
+    def get_embeddings(self) -> Embeddings:
         """
-        Get or create embeddings model.
+        Get or create embeddings model. When embedding_cache_dir is set, the model is wrapped
+        in a content-addressed cache so unchanged chunks are never re-embedded across runs.
+        Query embeddings are memoized in an LRU cache unless query_cache_size is 0.
         
         Implements FR-002 (Knowledge Retrieval).
         
         Returns:
-            HuggingFace embeddings instance
+            Embeddings for the configured backend, optionally wrapped in caches
         """
         if self._embeddings is None:
-            logger.info(f"Loading embeddings model: {self.config.embedding_model}")
-            self._embeddings = HuggingFaceEmbeddings(model_name=self.config.embedding_model)
+            embeddings = self._model = self._load_model()
+            
+            if self.config.embedding_cache_dir:
+                # Keys are hashes of chunk text, namespaced by the model identity (backend,
+                # ONNX file, precision, ...) so vectors from different setups never mix. The
+                # identity is hashed since file store keys only allow path-safe characters.
+                identity_hash = hashlib.sha256(repr(self._model_identity()).encode()).hexdigest()
+                logger.info(f"Using embedding cache: {self.config.embedding_cache_dir}")
+                embeddings = CacheBackedEmbeddings.from_bytes_store(
+                    embeddings,
+                    LocalFileStore(self.config.embedding_cache_dir),
+                    namespace=f"{self.config.embedding_model}/{identity_hash[:16]}/",
+                    key_encoder="sha256",
+                )
+            
+            if self.config.query_cache_size > 0:
+                embeddings = QueryCachedEmbeddings(
+                    embeddings, maxsize=self.config.query_cache_size
+                )
+            self._embeddings = embeddings
         return self._embeddings
     
-    def create_vectorstore(self, chunks: List[Document], reset: bool = True) -> Chroma:
+    def _resolve_device(self) -> Tuple[str, "torch.dtype"]:
+        """Return the torch device and weight dtype the hf backend loads the model with."""
+        # Imported lazily so loading/chunking code paths don't pay torch's import cost
+        import torch
+        
+        device = self.config.embedding_device
+        if device in (None, "auto"):
+            if torch.cuda.is_available():
+                device = "cuda"
+            elif torch.backends.mps.is_available():
+                device = "mps"
+            else:
+                device = "cpu"
+        # Half precision halves memory bandwidth on GPU (bf16 where supported for its fp32
+        # range, fp16 otherwise); CPUs stay in fp32
+        if device.startswith("cuda"):
+            dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            dtype = torch.float32
+        return device, dtype
+    
+    def _model_identity(self) -> Tuple:
+        """
+        Return the settings that determine the vectors the embedding model produces. Used to
+        key the loaded-model cache, namespace the embedding cache and fingerprint persisted
+        collections, so changing any of them never reuses vectors from another setup.
+        """
+        backend = self.config.embedding_backend
+        model_name = self.config.embedding_model
+        if backend == "infinity":
+            return (backend, model_name, self.config.infinity_api_url)
+        if backend == "fastembed":
+            return (backend, model_name)
+        _, dtype = self._resolve_device()
+        onnx_file = self.config.embedding_onnx_file
+        # ONNX exports carry their own precision, so the torch dtype doesn't apply
+        return (backend, model_name, onnx_file, None if onnx_file else str(dtype))
+    
+    def _load_model(self) -> Embeddings:
+        """
+        Return the shared embedding model for the configured backend, loading it on first use.
+        Non-default backends are imported only when selected (FastEmbed also needs the
+        fastembed extra).
+        """
+        backend = self.config.embedding_backend
+        model_name = self.config.embedding_model
+        if backend == "infinity":
+            from langchain_community.embeddings import InfinityEmbeddings
+            
+            # A thin HTTP client; the server handles batching and precision
+            logger.info(f"Using Infinity embeddings server: {self.config.infinity_api_url}")
+            return InfinityEmbeddings(
+                model=model_name, infinity_api_url=self.config.infinity_api_url
+            )
+        
+        if backend == "fastembed":
+            from langchain_community.embeddings.fastembed import FastEmbedEmbeddings
+            
+            key = self._model_identity()
+            with _MODEL_CACHE_LOCK:
+                if key not in _MODEL_CACHE:
+                    logger.info(f"Loading FastEmbed model: {model_name}")
+                    _MODEL_CACHE[key] = FastEmbedEmbeddings(
+                        model_name=model_name, threads=os.cpu_count()
+                    )
+                return _MODEL_CACHE[key]
+        
+        import torch
+        
+        device, dtype = self._resolve_device()
+        batch_size = self.config.embedding_batch_size or (
+            256 if device.startswith("cuda") else 128
+        )
+        
+        model_kwargs = {"device": device, "model_kwargs": {"torch_dtype": dtype}}
+        onnx_file = self.config.embedding_onnx_file
+        if onnx_file:
+            # Run a pre-exported (e.g., int8-quantized) ONNX graph instead of PyTorch weights
+            model_kwargs = {"device": device, "backend": "onnx",
+                            "model_kwargs": {"file_name": onnx_file}}
+        
+        multi_process = self.config.embedding_multi_process
+        key = self._model_identity() + (device, batch_size, multi_process)
+        with _MODEL_CACHE_LOCK:
+            embeddings = _MODEL_CACHE.get(key)
+            if embeddings is None:
+                logger.info(
+                    f"Loading embeddings model: {model_name} "
+                    f"(device={device}, batch_size={batch_size}, "
+                    f"multi_process={multi_process}, onnx_file={onnx_file})"
+                )
+                # Always load in-process: HuggingFaceEmbeddings' own multi_process mode starts
+                # and stops a pool on every call and ignores encode_kwargs
+                embeddings = HuggingFaceEmbeddings(
+                    model_name=model_name,
+                    model_kwargs=model_kwargs,
+                    encode_kwargs={"batch_size": batch_size, "normalize_embeddings": True},
+                )
+                if dtype != torch.float32 and not onnx_file:
+                    # Pool and normalize in fp32 so half-precision reductions don't drift
+                    embeddings._client[0].register_forward_hook(_upcast_token_embeddings)
+                if multi_process:
+                    embeddings = PooledDocumentEmbeddings(embeddings, batch_size)
+                _MODEL_CACHE[key] = embeddings
+        return embeddings
+    
+    def create_vectorstore(self, chunks: List[Document], reset: bool = False) -> Chroma:
         """
         Create ChromaDB vectorstore from document chunks.
         
@@ -338,23 +786,21 @@ class DataManager:
         
         Args:
             chunks: List of document chunks to store.
-            reset: If True, drop existing collection before creating.
+            reset: If True, always drop an existing collection and rebuild. Otherwise an
+                existing collection is reused when built from identical chunks and settings.
         
         Returns:
             Chroma vectorstore instance.
         """
-        embeddings = self.get_embeddings()
-        
-        # Use EphemeralClient for faster in-memory storage
-        chroma_client = chromadb.EphemeralClient(Settings(anonymized_telemetry=False))
-        
-        # Drop existing collection if requested
-        if reset:  # pragma: no cover
-            try:
-                chroma_client.delete_collection(self.config.db_name)
-                logger.info(f"Dropped existing collection: {self.config.db_name}")
-            except Exception:  # pragma: no cover
-                pass  # Collection doesn't exist yet
+        # Persist to disk when configured so restarts can reuse embeddings; otherwise use
+        # EphemeralClient for faster in-memory storage
+        settings = Settings(anonymized_telemetry=False)
+        if self.config.persist_dir:
+            chroma_client = chromadb.PersistentClient(
+                path=self.config.persist_dir, settings=settings
+            )
+        else:
+            chroma_client = chromadb.EphemeralClient(settings)
         
         # Validate chunks - ChromaDB requires at least one document
         if not chunks:
@@ -367,22 +813,118 @@ class DataManager:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        embeddings = self.get_embeddings()
+        collection_metadata = {
+            "hnsw:space": self.config.hnsw_space,
+            "hnsw:construction_ef": self.config.hnsw_construction_ef,
+            "hnsw:search_ef": self.config.hnsw_search_ef,
+            "hnsw:M": self.config.hnsw_m,
+            "chunk_metadata_version": _CHUNK_METADATA_VERSION,
+        }
+        fingerprint = _content_fingerprint(chunks, self._model_identity(), collection_metadata)
+        
+        # Unless a reset was requested, an existing collection (persisted from a previous run,
+        # or built earlier in this process) is reused as-is when it was built from identical
+        # chunks and settings, and dropped and rebuilt when stale
+        try:
+            existing = chroma_client.get_collection(self.config.db_name)
+        except Exception:
+            existing = None  # Collection doesn't exist yet
+        if existing is not None:
+            if (
+                not reset
+                and (existing.metadata or {}).get("content_fingerprint") == fingerprint
+                and existing.count() == len(chunks)
+            ):
+                logger.info(f"Reusing unchanged collection: {self.config.db_name}")
+                return self._wrap_collection(chroma_client, embeddings, len(chunks))
+            chroma_client.delete_collection(self.config.db_name)
+            logger.info(f"Dropped existing collection: {self.config.db_name}")
+        
+        collection = chroma_client.get_or_create_collection(
+            self.config.db_name,
+            metadata={**collection_metadata, "content_fingerprint": fingerprint},
+        )
+        
+        # Embed and insert in fixed-size batches so peak memory holds one batch of
+        # embeddings rather than the whole corpus
         logger.info(f"Creating vectorstore with {len(chunks)} chunks...")
-        vectorstore = Chroma.from_documents(
-            documents=chunks,
-            embedding=embeddings,
+        # sentence-transformers pads each batch to its longest text but only length-sorts
+        # within one encode call, so insert in global length order; this keeps similar
+        # lengths together in every batch. Insert order doesn't affect retrieval.
+        ordered = sorted(chunks, key=lambda chunk: len(chunk.page_content))
+        # Materialize plain lists once and slice them per batch
+        texts = [chunk.page_content for chunk in ordered]
+        metadatas = [chunk.metadata for chunk in ordered]
+        ids = [str(uuid.uuid4()) for _ in ordered]
+        
+        # Identical chunks (boilerplate, license blurbs, ...) are embedded only once. Only
+        # vectors for texts that occur more than once are kept around across batches.
+        digests = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in texts]
+        counts = collections.Counter(digests)
+        shared_vectors: Dict[bytes, List[float]] = {}
+        duplicates = len(digests) - len(counts)
+        if duplicates:
+            logger.info(f"Skipping embedding for {duplicates} duplicate chunks")
+        
+        batch_size = self.config.insert_batch_size
+        try:
+            for start in range(0, len(chunks), batch_size):
+                end = start + batch_size
+                batch_texts = texts[start:end]
+                batch_digests = digests[start:end]
+            
+                # Embed each text not seen in an earlier batch once
+                unique: Dict[bytes, int] = {}
+                to_embed = []
+                for text, digest in zip(batch_texts, batch_digests):
+                    if digest not in shared_vectors and digest not in unique:
+                        unique[digest] = len(to_embed)
+                        to_embed.append(text)
+                new_vectors = embeddings.embed_documents(to_embed) if to_embed else []
+            
+                batch_vectors = []
+                for digest in batch_digests:
+                    vector = shared_vectors.get(digest)
+                    if vector is None:
+                        vector = new_vectors[unique[digest]]
+                        if counts[digest] > 1:
+                            shared_vectors[digest] = vector
+                    batch_vectors.append(vector)
+            
+                collection.add(
+                    ids=ids[start:end],
+                    documents=batch_texts,
+                    metadatas=metadatas[start:end],  # type: ignore[arg-type]
+                    embeddings=batch_vectors,  # type: ignore[arg-type]
+                )
+                logger.info(f"  Inserted {min(end, len(chunks))}/{len(chunks)} chunks")
+        finally:
+            # Documents are only embedded here, so don't keep GPU worker processes around
+            # for the life of the app
+            if isinstance(self._model, PooledDocumentEmbeddings):
+                self._model.close()
+        
+        return self._wrap_collection(chroma_client, embeddings, len(chunks))
+    
+    def _wrap_collection(self, chroma_client, embeddings: Embeddings, count: int) -> Chroma:
+        """
+        Wrap the populated collection in a Chroma vectorstore for querying. count is the
+        number of documents the caller already knows it holds, so no COUNT query is issued.
+        """
+        vectorstore = Chroma(
             client=chroma_client,
             collection_name=self.config.db_name,
+            embedding_function=embeddings,
         )
         
-        count = vectorstore._collection.count()
         logger.info(f"Vectorstore created with {count} documents")
         
         self.vectorstore = vectorstore
         return vectorstore
     
     def setup_vectorstore(
-        self, github_repos: Optional[List[str]] = None, reset: bool = True
+        self, github_repos: Optional[List[str]] = None, reset: bool = False
     ) -> Chroma:
         """
         Complete pipeline: load, process, chunk, and create vectorstore. Automatically
@@ -394,7 +936,8 @@ class DataManager:
         Args:
             github_repos: Optional list of specific repos to load. Uses
                 self.config.github_repos if None.
-            reset: If True, drop existing collection before creating.
+            reset: If True, always rebuild the collection instead of reusing an
+                unchanged one.
 
         Returns:
             Chroma vectorstore instance ready for queries.
@@ -405,7 +948,7 @@ class DataManager:
     
     def show_docs_for_file(self, filename: str):  # pragma: no cover
         """
-        Retrieve and print chunks from the vectorstore whose metadata['file_path'] ends with the
+        Retrieve and print chunks from the vectorstore whose metadata['source'] ends with the
         given filename. Returns a list of (doc_id, metadata, document).
         
         DEBUG TOOL: Utility/debugging function - no corresponding FR/NFR.
@@ -416,18 +959,26 @@ class DataManager:
             )
             return []
         
-        all_docs = self.vectorstore.get()
         logger.info(f"Searching for chunks from file: {filename}")
-
-        ids = all_docs.get("ids", [])
-        metadatas = all_docs.get("metadatas", [])
-        documents = all_docs.get("documents", [])
-
-        matched = [
-            (doc_id, metadata, doc)
-            for doc_id, metadata, doc in zip(ids, metadatas, documents)
-            if metadata.get("file_path", "").endswith(filename)
-        ]
+        
+        def _match(results) -> list:
+            ids = results.get("ids", [])
+            metadatas = results.get("metadatas", [])
+            documents = results.get("documents", [])
+            return [
+                (doc_id, metadata, doc)
+                for doc_id, metadata, doc in zip(ids, metadatas, documents)
+                if metadata.get("source", "").endswith(filename)
+            ]
+        
+        # Let Chroma narrow to chunks with a matching basename instead of pulling everything;
+        # only collections built before chunks carried a basename need a full scan
+        collection_metadata = self.vectorstore._collection.metadata or {}
+        if collection_metadata.get("chunk_metadata_version", 0) >= 1:
+            results = self.vectorstore.get(where={"basename": os.path.basename(filename)})
+        else:
+            results = self.vectorstore.get()
+        matched = _match(results)
 
         logger.info(f"Found {len(matched)} chunks from {filename}:\n")
         for i, (doc_id, metadata, content) in enumerate(matched, 1):
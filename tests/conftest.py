@@ -0,0 +1,23 @@
+"""Shared pytest configuration for the ai-me test suite."""
+
+
+def pytest_addoption(parser):
+    """Register command-line options shared by all test directories."""
+    parser.addoption(
+        "--rebuild-db",
+        action="store_true",
+        default=False,
+        help="Rebuild the cached test vectorstore instead of reusing it",
+    )
+    parser.addoption(
+        "--mock-llm",
+        action="store_true",
+        default=False,
+        help="Answer integration test prompts with a deterministic canned LLM",
+    )
+    parser.addoption(
+        "--mock-llm-server",
+        action="store_true",
+        default=False,
+        help="Serve integration test prompts from a local OpenAI-compatible mock server",
+    )
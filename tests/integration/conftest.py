@@ -0,0 +1,65 @@
+"""Integration test setup and fixtures.
+
+Sets the deterministic-model and test-document environment shared by every integration
+module, and provides the opt-in deterministic LLMs used with --mock-llm (Runner.run
+replaced in process) and --mock-llm-server (a local OpenAI-compatible HTTP server), so the
+integration suite can run without LLM API keys or cost.
+"""
+import os
+
+import pytest
+
+from mock_llm import CannedLLM, MockLLMServer
+
+# Environment for every integration module, set here because pytest imports conftest.py
+# before any test module (and so before anything imports config, agent or data)
+
+# Set temperature and seed for deterministic test results
+os.environ["TEMPERATURE"] = "0"
+os.environ["SEED"] = "42"
+
+# Point our RAG to the tests/data directory
+os.environ["DOC_ROOT"] = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+os.environ["LOCAL_DOCS"] = "**/*.md"
+
+
+@pytest.fixture(scope="session")
+def mock_llm(request):
+    """
+    Replace agent.Runner.run with a CannedLLM for the session when --mock-llm is given;
+    otherwise a no-op that yields None so tests hit the real model.
+    
+    Only Runner.run is replaced, so AIMeAgent.run's normalization, logging and error
+    handling still execute (and tests can still patch Runner.run themselves).
+    """
+    if not request.config.getoption("--mock-llm"):
+        yield None
+        return
+    llm = CannedLLM()
+    with pytest.MonkeyPatch.context() as mp:
+        # Config requires a Groq key even though no request will reach Groq
+        if not os.environ.get("GROQ_API_KEY"):
+            mp.setenv("GROQ_API_KEY", "mock-llm")
+        mp.setattr("agent.Runner.run", llm.run)
+        yield llm
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_llm_server(request):
+    """
+    Start a MockLLMServer for the session when --mock-llm-server is given and point Config
+    at it through LLM_BASE_URL; otherwise a no-op yielding None.
+    
+    Autouse so the environment is set before any test builds a Config.
+    """
+    if not request.config.getoption("--mock-llm-server"):
+        yield None
+        return
+    server = MockLLMServer().start()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("LLM_BASE_URL", server.base_url)
+        # Config requires a Groq key even though no request will reach Groq
+        if not os.environ.get("GROQ_API_KEY"):
+            mp.setenv("GROQ_API_KEY", "mock-llm")
+        yield server
+    server.stop()
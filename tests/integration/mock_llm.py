@@ -0,0 +1,190 @@
+"""Deterministic LLM stand-ins for the integration tests.
+
+CannedLLM answers the integration test prompts with fixed responses. MockLLMServer serves
+those responses over a local OpenAI-compatible HTTP API, so the real client, serialization
+and agent loop run without calling a hosted model.
+"""
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# "My favorite color is X." statements the fake memory remembers
+_FAVORITE_COLOR_RE = re.compile(r"favorite color is (\w+)", re.IGNORECASE)
+
+
+class CannedLLM:
+    """
+    Deterministic stand-in for Runner.run: answers each test prompt with a fixed response
+    that satisfies the integration assertions, and remembers facts the user shares within
+    one agent's lifetime (like the memory MCP server does).
+    """
+    
+    def __init__(self):
+        self.memory: Dict[str, str] = {}
+    
+    def respond(self, user_input: str) -> str:
+        """Return the canned response for a prompt."""
+        query = user_input.lower()
+        
+        color = _FAVORITE_COLOR_RE.search(user_input)
+        if color:
+            self.memory["favorite color"] = color.group(1)
+            return f"Got it, I'll remember that your favorite color is {color.group(1)}."
+        if "favorite color" in query:
+            remembered = self.memory.get("favorite color")
+            if remembered is None:
+                return "I don't know your favorite color yet."
+            return f"Your favorite color is {remembered}."
+        if "it-245" in query or "rear" in query:
+            return (
+                "IT-245 is my disaster recovery project rolling out Relax-and-Recover (ReaR) "
+                "across production servers. Source: tests/data/projects.md"
+            )
+        if "carol" in query:
+            return "Yes, I know Carol - she is our Product Owner. Source: tests/data/team.md"
+        if "slartibartfast" in query:
+            return "I don't know Slartibartfast; I have no information about that person."
+        if "date" in query:
+            return f"Today's date is {datetime.now().strftime('%Y-%m-%d')}."
+        if "commits" in query:
+            return "My recent commits include a1b2c3d and 4e5f6a7 in byoung/ai-me."
+        if "python" in query:
+            return "Yes, I have years of Python experience. Source: tests/data/team.md"
+        return (
+            "I specialize in backend systems, and my experience in technology spans Python, "
+            "Go, and infrastructure work. Source: tests/data/team.md"
+        )
+    
+    async def run(self, agent, user_input: str, **kwargs) -> SimpleNamespace:
+        """Async Runner.run replacement returning an object with final_output."""
+        return SimpleNamespace(final_output=self.respond(user_input))
+
+
+def _last_user_text(messages: Any) -> str:
+    """Extract the latest user message text from a chat or responses API payload."""
+    if isinstance(messages, str):
+        return messages
+    for message in reversed(messages or []):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content", "")
+        if isinstance(content, str):
+            return content
+        # Content parts: [{"type": "input_text" | "text", "text": "..."}]
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+class MockLLMServer:
+    """
+    Local OpenAI-compatible server answering with a CannedLLM. Implements GET /v1/models,
+    POST /v1/chat/completions and POST /v1/responses (non-streaming), which covers both
+    APIs the agents SDK can use.
+    """
+    
+    def __init__(self, model: str = "mock-llm"):
+        self.llm = CannedLLM()
+        self.model = model
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        """OpenAI-style base URL, e.g. http://127.0.0.1:PORT/v1."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+    
+    def start(self) -> "MockLLMServer":
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    
+    def chat_completion(self, body: Dict) -> Dict:
+        """Build a chat.completion payload for a request body."""
+        text = self.llm.respond(_last_user_text(body.get("messages")))
+        return {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", self.model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+    
+    def response(self, body: Dict) -> Dict:
+        """Build a responses API payload for a request body."""
+        text = self.llm.respond(_last_user_text(body.get("input")))
+        return {
+            "id": "resp_mock",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": body.get("model", self.model),
+            "output": [{
+                "type": "message",
+                "id": "msg_mock",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "total_tokens": 0,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+    
+    def _handler_class(self) -> type:
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _send_json(self, payload: Dict, status: int = 200) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_GET(self) -> None:
+                if self.path.split("?")[0].endswith("/models"):
+                    models: List[Dict] = [
+                        {"id": server.model, "object": "model", "owned_by": "mock"}
+                    ]
+                    self._send_json({"object": "list", "data": models})
+                else:
+                    self._send_json({"error": {"message": "not found"}}, status=404)
+            
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                path = self.path.split("?")[0]
+                if path.endswith("/chat/completions"):
+                    self._send_json(server.chat_completion(body))
+                elif path.endswith("/responses"):
+                    self._send_json(server.response(body))
+                else:
+                    self._send_json({"error": {"message": "not found"}}, status=404)
+            
+            def log_message(self, format: str, *args) -> None:
+                # Keep the default stderr access log out of test output
+                pass
+        
+        return Handler
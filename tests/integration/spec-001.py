@@ -2,85 +2,141 @@
 Integration tests for ai-me agent.
 Tests the complete setup including vectorstore, agent configuration, and agent responses.
 """
+import asyncio
+import contextlib
+import functools
 import pytest
 import pytest_asyncio
 import re
-import sys
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Tuple
 from unittest.mock import AsyncMock, patch
 
 # Something about these tests makes me feel yucky. Big, brittle, and slow. BBS?
 # In the future we should run inference locally with docker-compose models.
 
-# Set temperature and seed for deterministic test results
-os.environ["TEMPERATURE"] = "0"
-os.environ["SEED"] = "42"
-
-# Point our RAG to the tests/data directory
+# TEMPERATURE, SEED, DOC_ROOT and LOCAL_DOCS are set by conftest.py before this module loads
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-test_data_dir = os.path.join(project_root, "tests", "data")
-os.environ["DOC_ROOT"] = test_data_dir
-os.environ["LOCAL_DOCS"] = "**/*.md"
+test_data_dir = os.environ["DOC_ROOT"]
 
 from config import setup_logger, Config
-from agent import AIMeAgent
-from data import DataManager, DataManagerConfig
+
+# agent and data (and through them chromadb, langchain and the embedding stack) are imported
+# inside the fixtures and tests that use them, so collection stays cheap
 
 logger = setup_logger(__name__)
 
+# Every test shares the session event loop, so they can use the session-scoped agent
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+# MCP servers a test can ask for, by name
+_MCP_SERVER_PARAMS = {
+    "github": lambda agent: agent.mcp_github_params,
+    "time": lambda agent: agent.mcp_time_params,
+    "memory": lambda agent: agent.get_mcp_memory_params(agent.session_id),
+}
+
+
+def mcp_servers(*names: str):
+    """Start the ai_me_agent fixture with the named MCP servers (it starts none otherwise)."""
+    return pytest.mark.parametrize(
+        "ai_me_agent", [names], indirect=True, ids=["+".join(names)]
+    )
+
+# Phrases that indicate the agent admits it lacks knowledge, matched in one regex scan.
+# AIMeAgent.run already maps curly quotes and non-breaking spaces to ASCII.
+_NEGATIVE_RE = re.compile(
+    r"don't know|not familiar|no information|don't have any information", re.IGNORECASE
+)
+
+# Forms of source attribution: a GitHub URL, a markdown file reference, or (in any case) the
+# words "source" or "documentation", matched in one regex scan
+_SOURCE_RE = re.compile(r"https://github\.com/|\.md|(?i:source|documentation)")
+
+# First-person markers ("I", "me", "my", "myself", and I followed by ', m, v, e or l as in
+# I'm/I've/I'll), matched in one regex scan
+_FIRST_PERSON_RE = re.compile(r"\b(?:i|me|my|myself)\b|\bi['mvel]", re.IGNORECASE)
+
+# Turn cap for single-question runs: at temperature 0 answers arrive within a few turns,
+# so a model stuck in a tool loop fails fast instead of running to the agent's default
+_MAX_TURNS = 5
+
 # ============================================================================
 # SHARED CACHING - Initialize on first use, then reuse
 # ============================================================================
 
-_config = None
-_vectorstore = None
-_data_manager = None
+@functools.lru_cache(maxsize=1)
+def _get_shared_config() -> Config:
+    """Lazy initialization of the one Config shared by every fixture and test."""
+    config = Config()  # type: ignore
+    logger.info(f"Initialized shared config: {config.bot_full_name}")
+    return config
 
 
-def _get_shared_config():
-    """Lazy initialization of shared config."""
-    global _config
-    if _config is None:
-        _config = Config()  # type: ignore
-        logger.info(f"Initialized shared config: {_config.bot_full_name}")
-    return _config
+def _worker_suffix(worker_id: str) -> str:
+    """Suffix keeping per-process files apart under pytest-xdist ('' when not distributed)."""
+    return "" if worker_id == "master" else f"-{worker_id}"
 
 
-def _get_shared_vectorstore():
-    """Lazy initialization of shared vectorstore."""
-    global _vectorstore, _data_manager
-    if _vectorstore is None:
-        logger.info("Initializing shared vectorstore (first test)...")
-        test_data_dir = os.path.join(project_root, "tests", "data")
-        _data_config = DataManagerConfig(
-            doc_root=test_data_dir
-        )
-        _data_manager = DataManager(config=_data_config)
-        _vectorstore = _data_manager.setup_vectorstore()
-        logger.info(f"Shared vectorstore ready: {_vectorstore._collection.count()} documents")
-    return _vectorstore
+@pytest.fixture(scope="session")
+def shared_data_manager(worker_id):
+    """
+    The one DataManager for tests/data, shared by the session vectorstore and by tests
+    that only exercise document processing.
+    
+    Its collection is persisted under .cache/, one copy per pytest-xdist worker, since
+    concurrent builds can't share one store.
+    """
+    from data import DataManager, DataManagerConfig
+    
+    data_config = DataManagerConfig(
+        doc_root=test_data_dir,
+        persist_dir=os.path.join(
+            project_root, ".cache", f"test-chroma{_worker_suffix(worker_id)}"
+        ),
+    )
+    return DataManager(config=data_config)
 
 
-@pytest_asyncio.fixture(scope="function")
-async def ai_me_agent():
+@pytest.fixture(scope="session")
+def shared_vectorstore(request, shared_data_manager):
     """
-    Setup fixture for ai-me agent with vectorstore and MCP servers.
+    Build the tests/data vectorstore once per session.
     
-    CRITICAL: Function-scoped fixture prevents hanging/blocking issues.
-    Each test gets its own agent instance with proper cleanup.
+    Later runs reuse the persisted collection without re-embedding while tests/data is
+    unchanged (its content fingerprint still matches). Pass --rebuild-db to force a cold
+    rebuild.
     
-    Reuses shared config and vectorstore (lazy-initialized on first use).
+    The embedding model loads in a background thread while documents are loaded and
+    chunked. The data module's model cache lock makes the build wait for that load rather
+    than repeat it, and a load error is raised again by the build's own attempt.
+    """
+    logger.info("Initializing shared vectorstore...")
+    with ThreadPoolExecutor(max_workers=1) as warm_up:
+        warm_up.submit(shared_data_manager.get_embeddings)
+        vectorstore = shared_data_manager.setup_vectorstore(
+            reset=request.config.getoption("--rebuild-db")
+        )
+    logger.info("Shared vectorstore ready")
+    return vectorstore
+
+
+@contextlib.asynccontextmanager
+async def _running_agent(vectorstore, session_id: str, mcp_servers: Tuple[str, ...]):
+    """
+    Create an ai-me agent and keep it (and the named MCP servers) running until the block
+    exits.
     
-    This fixture:
-    - Reuses shared config and vectorstore
-    - Creates agent WITH real subprocess MCP servers (GitHub, Time, Memory)
-    - Yields agent for test
-    - Cleans up MCP servers after test completes
+    MCP stdio clients must be connected and cleaned up from the same task, but pytest-asyncio
+    runs fixture setup and teardown in different tasks. A dedicated owner task therefore
+    connects the servers, waits for the block to finish, and cleans them up itself.
     """
+    from agent import AIMeAgent
+    
     config = _get_shared_config()
-    vectorstore = _get_shared_vectorstore()
     
     # Initialize agent config with shared vectorstore
     aime_agent = AIMeAgent(
@@ -88,36 +144,80 @@ async def ai_me_agent():
         model=config.model,
         vectorstore=vectorstore,
         github_token=config.github_token,
-        session_id="test-session"
+        session_id=session_id
     )
     
-    # Create the agent WITH MCP servers enabled
-    logger.info("Creating ai-me agent with MCP servers...")
-    assert aime_agent.session_id is not None, "session_id should be set"
-    await aime_agent.create_ai_me_agent(
-        mcp_params=[
-            aime_agent.mcp_github_params,
-            aime_agent.mcp_time_params,
-            aime_agent.get_mcp_memory_params(aime_agent.session_id),
-        ]
-    )
-    logger.info("Agent created successfully with MCP servers")
-    logger.info(f"Temperature set to {config.temperature}")
-    logger.info(f"Seed set to {config.seed}")
+    ready = asyncio.Event()
+    done = asyncio.Event()
+    
+    async def own_agent():
+        try:
+            # Create the agent with only the MCP servers the test exercises
+            logger.info(f"Creating ai-me agent with MCP servers: {mcp_servers}")
+            mcp_params = [_MCP_SERVER_PARAMS[name](aime_agent) for name in mcp_servers]
+            await aime_agent.create_ai_me_agent(mcp_params=mcp_params or None)
+        finally:
+            ready.set()
+        logger.info("Agent created successfully with MCP servers")
+        logger.info(f"Temperature set to {config.temperature}")
+        logger.info(f"Seed set to {config.seed}")
+        
+        await done.wait()
+        # CRITICAL: Cleanup when the fixture ends to prevent hanging
+        logger.info("Cleaning up MCP servers...")
+        await aime_agent.cleanup()
+        logger.info("Cleanup complete")
+    
+    owner = asyncio.create_task(own_agent())
+    await ready.wait()
+    if owner.done():
+        owner.result()  # Re-raise agent creation failures
+    try:
+        yield aime_agent
+    finally:
+        done.set()
+        await owner
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def ai_me_agent(request, shared_vectorstore, mock_llm, worker_id):
+    """
+    Setup fixture for ai-me agent with vectorstore and MCP servers, shared by every
+    read-only test in the session that needs the same servers.
     
-    # Yield the agent for the test
-    yield aime_agent
+    This fixture:
+    - Reuses shared config and vectorstore
+    - Creates agent with the MCP servers selected by @mcp_servers (none by default), which
+      are skipped when --mock-llm replaces the model with canned responses
+    - Yields agent until a test needs a different set of servers or the session ends
+    - Cleans up MCP servers afterwards
     
-    # CRITICAL: Cleanup after test completes to prevent hanging
-    logger.info("Cleaning up MCP servers after test...")
-    await aime_agent.cleanup()
-    logger.info("Cleanup complete")
+    Tests that change agent state (e.g., memory) use fresh_agent instead.
+    """
+    # Session ids name the memory server's file, so xdist workers each get their own
+    session_id = f"test-session{_worker_suffix(worker_id)}"
+    servers = () if mock_llm else getattr(request, "param", ())
+    async with _running_agent(shared_vectorstore, session_id, servers) as agent:
+        yield agent
+
 
+@pytest_asyncio.fixture(loop_scope="session")
+async def fresh_agent(shared_vectorstore, mock_llm, worker_id):
+    """Function-scoped ai-me agent with its own memory MCP server, for tests that mutate
+    agent state."""
+    servers = () if mock_llm else ("memory",)
+    async with _running_agent(
+        shared_vectorstore, f"test-session-isolated{_worker_suffix(worker_id)}", servers
+    ) as agent:
+        yield agent
 
-@pytest.mark.asyncio
-async def test_github_documents_load():
+
+async def test_github_documents_load(mock_llm):
     """Tests FR-002: GitHub document loading with source metadata."""
-    config = Config()  # type: ignore
+    from agent import AIMeAgent
+    from data import DataManager, DataManagerConfig
+    
+    config = _get_shared_config()
     
     # Load GitHub documents directly
     github_config = DataManagerConfig(
@@ -135,52 +235,47 @@ async def test_github_documents_load():
     )
     await agent.create_ai_me_agent()
 
-    response = await agent.run("Do you have python experience?")
+    response = await agent.run("Do you have python experience?", max_turns=_MAX_TURNS)
     
     assert "yes" in response.lower(), (
         f"yes' in response but got: {response}"
     )
 
 
-@pytest.mark.asyncio
 async def test_rear_knowledge_contains_it245(ai_me_agent):
     """Tests REQ-001: Knowledge base retrieval of personal documentation."""
-    response = await ai_me_agent.run("What is IT-245?")
+    response = await ai_me_agent.run("What is IT-245?", max_turns=_MAX_TURNS)
     
     assert "IT-245" in response or "It-245" in response or "it-245" in response
     logger.info("✓ IT-245 found in response")
 
 
-@pytest.mark.asyncio
+@mcp_servers("github")
 async def test_github_commits_contains_shas(ai_me_agent):
     """Tests REQ-002: MCP GitHub integration - retrieve commit history."""
-    response = await ai_me_agent.run("What are some recent commits I've made?")
+    response = await ai_me_agent.run("What are some recent commits I've made?", max_turns=_MAX_TURNS)
     
     assert response, "Response is empty"
     assert len(response) > 10, "Response is too short"
     logger.info("✓ Response contains commit information")
 
-@pytest.mark.asyncio
 async def test_unknown_person_contains_negative_response(ai_me_agent):
     """Tests REQ-003: Graceful handling of out-of-scope requests."""
     response = await ai_me_agent.run(
-        "Do you know Slartibartfast?"  # Presumed unknown person
+        "Do you know Slartibartfast?",  # Presumed unknown person
+        max_turns=_MAX_TURNS,
     )
     
     assert response, "Response is empty"
-    assert (
-        "don't know" in response.lower() 
-        or "not familiar" in response.lower() 
-        or "no information" in response.lower()
-        or "don't have any information" in response.lower()
-    ), f"Response doesn't indicate lack of knowledge: {response}"
+    assert _NEGATIVE_RE.search(response), (
+        f"Response doesn't indicate lack of knowledge: {response}"
+    )
     logger.info(f"✓ Test passed - correctly handled out-of-scope query")
 
 
-@pytest.mark.asyncio
 async def test_carol_knowledge_contains_product(ai_me_agent):
     """Tests FR-002, FR-003: Verify asking about Carol returns 'product'."""
-    response_raw = await ai_me_agent.run("Do you know Carol?")
+    response_raw = await ai_me_agent.run("Do you know Carol?", max_turns=_MAX_TURNS)
     response = response_raw.lower()  # Convert to lowercase for matching
     
     # Assert that 'product' appears in the response (Carol is Product Owner)
@@ -190,10 +285,10 @@ async def test_carol_knowledge_contains_product(ai_me_agent):
     logger.info("✓ Test passed: Response contains 'product'")
 
 
-@pytest.mark.asyncio
+@mcp_servers("time")
 async def test_mcp_time_server_returns_current_date(ai_me_agent):
     """Tests FR-009, NFR-001: Verify that the MCP time server returns the current date."""
-    response = await ai_me_agent.run("What is today's date?")
+    response = await ai_me_agent.run("What is today's date?", max_turns=_MAX_TURNS)
 
     # Check for current date in various formats (ISO or natural language)
     now = datetime.now()
@@ -222,13 +317,12 @@ async def test_mcp_time_server_returns_current_date(ai_me_agent):
     logger.info(f"✓ Test passed: Response contains current date")
 
 
-@pytest.mark.asyncio
-async def test_mcp_memory_server_remembers_favorite_color(ai_me_agent):
+async def test_mcp_memory_server_remembers_favorite_color(fresh_agent):
     """Tests FR-013, NFR-002: 
         Verify that the MCP memory server persists information across interactions.
     """
-    await ai_me_agent.run("My favorite color is chartreuse.")
-    response2 = await ai_me_agent.run("What's my favorite color?")
+    await fresh_agent.run("My favorite color is chartreuse.")
+    response2 = await fresh_agent.run("What's my favorite color?")
     
     # Check that the agent remembers the color
     assert "chartreuse" in response2.lower(), (
@@ -242,8 +336,7 @@ async def test_mcp_memory_server_remembers_favorite_color(ai_me_agent):
     logger.info(msg)
 
 
-@pytest.mark.asyncio
-async def test_github_relative_links_converted_to_absolute_urls():
+async def test_github_relative_links_converted_to_absolute_urls(shared_data_manager):
     """Tests FR-004: Document processing converts relative GitHub links to absolute URLs.
     
     Validates that when documents are loaded from GitHub with relative links 
@@ -270,9 +363,7 @@ async def test_github_relative_links_converted_to_absolute_urls():
         "Sample doc metadata should have github_repo"
     )
     
-    data_config = DataManagerConfig()
-    data_manager = DataManager(config=data_config)
-    processed_docs = data_manager.process_documents([sample_doc])
+    processed_docs = shared_data_manager.process_documents([sample_doc])
     
     assert len(processed_docs) == 1, "Expected 1 processed document"
     processed_content = processed_docs[0].page_content
@@ -292,7 +383,6 @@ async def test_github_relative_links_converted_to_absolute_urls():
     logger.info(f"  Converted: [my resume](https://github.com/byoung/ai-me/blob/main/resume.md)")
 
 
-@pytest.mark.asyncio
 async def test_agent_responses_cite_sources(ai_me_agent):
     """Tests FR-004, FR-011: Agent responses include source citations.
     
@@ -305,18 +395,13 @@ async def test_agent_responses_cite_sources(ai_me_agent):
     ]
     
     for question in questions:
-        logger.info(f"\n{'='*60}\nSource citation test: {question}\n{'='*60}")
+        logger.debug(f"\n{'='*60}\nSource citation test: {question}\n{'='*60}")
         
-        response = await ai_me_agent.run(question)
+        response = await ai_me_agent.run(question, max_turns=_MAX_TURNS)
         
         # Check that response includes some form of source attribution
         # Could be: GitHub URL, local path, "Sources" section, etc.
-        has_source = (
-            "https://github.com/" in response or
-            ".md" in response or  # Local markdown file reference
-            "source" in response.lower() or
-            "documentation" in response.lower()
-        )
+        has_source = _SOURCE_RE.search(response)
         assert has_source, (
             f"Expected source attribution in response to '{question}' "
             f"but found none. Response: {response}"
@@ -333,7 +418,6 @@ async def test_agent_responses_cite_sources(ai_me_agent):
     logger.info("\n✓ Test passed: Agent responses cite sources (FR-004, FR-011)")
 
 
-@pytest.mark.asyncio
 async def test_user_story_2_multi_topic_consistency(ai_me_agent):
     """
     Tests FR-001, FR-003, FR-005, NFR-002: User Story 2 - Multi-Topic Consistency
@@ -353,22 +437,13 @@ async def test_user_story_2_multi_topic_consistency(ai_me_agent):
         ("What programming languages are you skilled in?", "programming|language|skilled"),
     ]
     
-    first_person_patterns = [
-        r"\bi\b", r"\bme\b", r"\bmy\b", r"\bmyself\b", 
-        r"\bI['m]", r"\bI['ve]", r"\bI['ll]"
-    ]
-    
     for question, topic_keywords in topics:
-        logger.info(f"\n{'='*60}\nMulti-topic test question: {question}\n{'='*60}")
+        logger.debug(f"\n{'='*60}\nMulti-topic test question: {question}\n{'='*60}")
         
-        response = await ai_me_agent.run(question)
-        response_lower = response.lower()
+        response = await ai_me_agent.run(question, max_turns=_MAX_TURNS)
         
         # Check for first-person usage
-        first_person_found = any(
-            re.search(pattern, response, re.IGNORECASE) 
-            for pattern in first_person_patterns
-        )
+        first_person_found = _FIRST_PERSON_RE.search(response)
         assert first_person_found, (
             f"Expected first-person perspective in response to '{question}' "
             f"but got: {response}"
@@ -386,7 +461,6 @@ async def test_user_story_2_multi_topic_consistency(ai_me_agent):
     logger.info("\n✓ Test passed: Consistent first-person perspective across 3+ topics")
 
 
-@pytest.mark.asyncio
 async def test_tool_failure_error_messages_are_friendly(caplog, ai_me_agent):
     """
     Tests FR-012, NFR-003: Error Message Quality (FR-012)
@@ -399,7 +473,7 @@ async def test_tool_failure_error_messages_are_friendly(caplog, ai_me_agent):
 
     Uses mocking to simulate tool failures without adding test-specific code to agent.py
     """
-    logger.info(f"\n{'='*60}\nError Handling Test\n{'='*60}")
+    logger.debug(f"\n{'='*60}\nError Handling Test\n{'='*60}")
     
     # Mock the Runner.run method to simulate a tool failure
     # This tests the catch-all exception handler without adding test code to production
@@ -450,7 +524,6 @@ async def test_tool_failure_error_messages_are_friendly(caplog, ai_me_agent):
     logger.info("\n✓ Test passed: Error messages are friendly (FR-012) + properly logged")
 
 
-@pytest.mark.asyncio
 async def test_logger_setup_format(caplog):
     """Tests NFR-003 (Structured Logging): Verify setup_logger creates structured logging.
     
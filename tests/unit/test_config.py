@@ -5,8 +5,9 @@ Tests configuration validation, Pydantic models, and environment variable parsin
 in isolation without requiring full application setup.
 """
 import logging
+from queue import Queue
 
-from config import Config
+from config import Config, DropOldestQueueHandler
 
 
 def test_config_github_repos_parsing():
@@ -34,3 +35,63 @@ def test_config_github_repos_parsing():
     # Test already a list
     result = Config.parse_github_repos(["owner/repo"])
     assert result == ["owner/repo"], "Already a list should pass through"
+
+
+def test_load_env_only_parses_dotenv_once(monkeypatch):
+    """Tests NFR-002 (Type-Safe Configuration): load_env is a one-shot guarded load.
+    
+    Once the loaded marker is set, subsequent calls must not re-parse .env unless
+    force=True is passed.
+    """
+    import config
+    
+    calls = []
+    monkeypatch.setattr(config, "load_dotenv", lambda: calls.append(True))
+    monkeypatch.setenv("_AI_ME_DOTENV_LOADED", "1")
+    
+    config.load_env()
+    assert calls == [], "Already-loaded .env should not be parsed again"
+    
+    config.load_env(force=True)
+    assert calls == [True], "force=True should reload .env"
+
+
+def test_config_reuses_existing_openai_client():
+    """Tests NFR-002 (Type-Safe Configuration): model_post_init keeps a supplied client.
+    
+    Rebuilding a Config with an existing AsyncOpenAI client must not replace it, so the
+    client's connection pool survives the rebuild.
+    """
+    first = Config(groq_api_key="test-key")  # type: ignore
+    assert first.openai_client is not None, "Client should be created on first init"
+    
+    second = Config(groq_api_key="test-key", openai_client=first.openai_client)  # type: ignore
+    assert second.openai_client is first.openai_client, "Existing client should be reused"
+
+
+def test_config_client_uses_llm_base_url():
+    """Tests NFR-002 (Type-Safe Configuration): LLM_BASE_URL redirects inference.
+    
+    The Groq endpoint is the default, but an OpenAI-compatible server (e.g., a local
+    mock in tests) can be targeted through llm_base_url.
+    """
+    default = Config(groq_api_key="test-key")  # type: ignore
+    assert str(default.openai_client.base_url).startswith("https://api.groq.com/openai/v1")
+    
+    local = Config(groq_api_key="test-key", llm_base_url="http://127.0.0.1:8000/v1")  # type: ignore
+    assert str(local.openai_client.base_url).startswith("http://127.0.0.1:8000/v1")
+
+
+def test_drop_oldest_queue_handler_keeps_newest_records():
+    """Tests NFR-003 (Structured Logging): A full log queue drops its oldest record.
+    
+    Remote log shipping must neither block the caller nor grow without bound, and the
+    most recent records are the ones worth keeping.
+    """
+    log_queue = Queue(maxsize=2)
+    handler = DropOldestQueueHandler(log_queue)
+    for message in ("first", "second", "third"):
+        handler.handle(logging.makeLogRecord({"msg": message}))
+    
+    kept = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+    assert kept == ["second", "third"], f"Expected the oldest record dropped, got: {kept}"
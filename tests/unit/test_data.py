@@ -9,6 +9,7 @@ import os
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
 
 from data import DataManager, DataManagerConfig
 
@@ -82,6 +83,61 @@ class TestLoadLocalDocuments:
         # Verify all patterns were processed (should have more docs due to overlap)
         assert len(docs) >= 3, "Expected at least 3 docs from test data"
 
+    def test_load_local_documents_overlapping_patterns_load_once(self):
+        """Tests FR-002: Files matched by several glob patterns are loaded once.
+        
+        Overlapping patterns like *.md and **/*.md must not produce duplicate
+        documents (which would otherwise be embedded twice).
+        """
+        test_data_dir = str(Path(__file__).parent.parent / "data")
+        
+        single = DataManager(config=DataManagerConfig(
+            doc_root=test_data_dir, doc_load_local=["**/*.md"]
+        )).load_local_documents()
+        overlapping = DataManager(config=DataManagerConfig(
+            doc_root=test_data_dir, doc_load_local=["*.md", "**/*.md"]
+        )).load_local_documents()
+        
+        sources = [doc.metadata["source"] for doc in overlapping]
+        assert len(sources) == len(set(sources)), "Expected no duplicate sources"
+        assert len(overlapping) == len(single), "Overlapping patterns should not add docs"
+
+    @pytest.mark.skipif(
+        not hasattr(os, "geteuid") or os.geteuid() == 0,
+        reason="needs POSIX permissions that apply to the current user (not root)",
+    )
+    def test_load_local_documents_skips_unreadable_directory(self, tmp_path):
+        """Tests FR-002: An unreadable subdirectory is skipped, not fatal.
+
+        Documents elsewhere under doc_root must still load when one subdirectory
+        can't be listed.
+        """
+        (tmp_path / "readable.md").write_text("# Readable\n\nStill loaded.")
+        locked = tmp_path / "locked"
+        locked.mkdir()
+        (locked / "hidden.md").write_text("# Hidden")
+        locked.chmod(0)
+        try:
+            docs = DataManager(config=DataManagerConfig(
+                doc_root=str(tmp_path)
+            )).load_local_documents()
+        finally:
+            locked.chmod(0o755)
+
+        sources = [doc.metadata["source"] for doc in docs]
+        assert sources == [str(tmp_path / "readable.md")], f"Got sources: {sources}"
+
+    def test_load_local_documents_doc_root_is_a_file(self, tmp_path):
+        """Tests FR-002: A doc_root pointing at a file loads nothing instead of raising."""
+        doc_file = tmp_path / "notes.md"
+        doc_file.write_text("# Notes")
+
+        docs = DataManager(config=DataManagerConfig(
+            doc_root=str(doc_file)
+        )).load_local_documents()
+
+        assert docs == [], "Expected no documents when doc_root is not a directory"
+
 
 class TestCreateVectorstore:
     """Tests for DataManager.create_vectorstore() method.
@@ -109,6 +165,170 @@ class TestCreateVectorstore:
         assert "docs/local-testing/" in error_message, "Should mention local docs path"
 
 
+    def test_create_vectorstore_inserts_all_chunks_in_batches(self):
+        """Tests FR-002: Chunks are embedded and inserted across several batches.
+        
+        With a batch size smaller than the number of chunks, every chunk must still
+        end up in the collection and be retrievable by similarity search.
+        """
+        chunks = [
+            Document(
+                page_content=f"Document number {i} about topic {i}",
+                metadata={"source": f"doc{i}.md", "chunk_index": i},
+            )
+            for i in range(5)
+        ]
+        config = DataManagerConfig(db_name="test_batches", insert_batch_size=2)
+        dm = DataManager(config=config)
+        
+        with patch.object(
+            dm, "get_embeddings", return_value=DeterministicFakeEmbedding(size=16)
+        ):
+            vectorstore = dm.create_vectorstore(chunks=chunks, reset=True)
+            results = vectorstore.similarity_search("Document number 3 about topic 3", k=1)
+        
+        assert vectorstore._collection.count() == 5, "Expected all chunks inserted"
+        assert results[0].metadata["source"] == "doc3.md", (
+            f"Expected exact-text query to match its chunk, got: {results}"
+        )
+
+
+    def test_create_vectorstore_embeds_duplicate_chunks_once(self):
+        """Tests FR-002: Identical chunk texts are embedded once but all inserted.
+        
+        Duplicates within a batch and across batches reuse the first vector, while
+        every chunk (with its own metadata) still ends up in the collection.
+        """
+        chunks = [
+            Document(page_content=text, metadata={"source": f"doc{i}.md"})
+            for i, text in enumerate(["License", "Unique A", "License", "Unique B", "License"])
+        ]
+        config = DataManagerConfig(db_name="test_dedup", insert_batch_size=2)
+        dm = DataManager(config=config)
+        embeddings = DeterministicFakeEmbedding(size=16)
+        
+        with patch.object(dm, "get_embeddings", return_value=embeddings), \
+                patch.object(
+                    DeterministicFakeEmbedding, "embed_documents", autospec=True,
+                    side_effect=DeterministicFakeEmbedding.embed_documents,
+                ) as mock_embed_documents:
+            vectorstore = dm.create_vectorstore(chunks=chunks, reset=True)
+        
+        embedded_texts = [
+            text for call in mock_embed_documents.call_args_list for text in call.args[1]
+        ]
+        assert sorted(embedded_texts) == ["License", "Unique A", "Unique B"], (
+            f"Expected each distinct text embedded once, got: {embedded_texts}"
+        )
+        assert vectorstore._collection.count() == 5, "Expected every chunk inserted"
+
+
+    def test_create_vectorstore_embeds_in_length_order(self):
+        """Tests FR-002: Chunks are embedded shortest-first so batches hold similar lengths."""
+        chunks = [
+            Document(page_content="x" * length, metadata={"source": f"doc{length}.md"})
+            for length in [50, 5, 400, 20, 100]
+        ]
+        dm = DataManager(config=DataManagerConfig(db_name="test_order", insert_batch_size=2))
+        
+        with patch.object(
+            dm, "get_embeddings", return_value=DeterministicFakeEmbedding(size=16)
+        ), patch.object(
+            DeterministicFakeEmbedding, "embed_documents", autospec=True,
+            side_effect=DeterministicFakeEmbedding.embed_documents,
+        ) as mock_embed_documents:
+            dm.create_vectorstore(chunks=chunks, reset=True)
+        
+        lengths = [
+            [len(text) for text in call.args[1]] for call in mock_embed_documents.call_args_list
+        ]
+        assert lengths == [[5, 20], [50, 100], [400]], (
+            f"Expected batches in ascending length order, got: {lengths}"
+        )
+
+
+    def test_persisted_collection_is_reused_without_reset(self, tmp_path):
+        """Tests FR-002: A persisted collection is reused instead of re-embedded.
+        
+        Building a second vectorstore from the same persist_dir with reset=False must
+        not embed any chunks when the collection already holds all of them.
+        """
+        chunks = [
+            Document(page_content=f"Persisted chunk {i}", metadata={"source": f"{i}.md"})
+            for i in range(3)
+        ]
+        config = DataManagerConfig(db_name="test_persist", persist_dir=str(tmp_path))
+        embeddings = DeterministicFakeEmbedding(size=16)
+        
+        first = DataManager(config=config)
+        with patch.object(first, "get_embeddings", return_value=embeddings):
+            first.create_vectorstore(chunks=chunks, reset=True)
+        
+        second = DataManager(config=config)
+        with patch.object(second, "get_embeddings", return_value=embeddings), \
+                patch.object(
+                    DeterministicFakeEmbedding, "embed_documents"
+                ) as mock_embed_documents:
+            vectorstore = second.create_vectorstore(chunks=chunks, reset=False)
+        
+        mock_embed_documents.assert_not_called()
+        assert vectorstore._collection.count() == 3, "Expected persisted chunks to be reused"
+
+    def test_unchanged_collection_is_reused_unless_reset(self):
+        """Tests FR-002: Rebuilding from identical chunks skips re-embedding by default.
+        
+        A second create_vectorstore call in the same process reuses the collection,
+        while reset=True still forces a full rebuild.
+        """
+        chunks = [
+            Document(page_content=f"Reloaded chunk {i}", metadata={"source": f"{i}.md"})
+            for i in range(3)
+        ]
+        dm = DataManager(config=DataManagerConfig(db_name="test_reuse"))
+        
+        with patch.object(
+            dm, "get_embeddings", return_value=DeterministicFakeEmbedding(size=16)
+        ), patch.object(
+            DeterministicFakeEmbedding, "embed_documents", autospec=True,
+            side_effect=DeterministicFakeEmbedding.embed_documents,
+        ) as mock_embed_documents:
+            dm.create_vectorstore(chunks=chunks)
+            dm.create_vectorstore(chunks=chunks)
+            assert mock_embed_documents.call_count == 1, "Expected the second build to reuse"
+            
+            vectorstore = dm.create_vectorstore(chunks=chunks, reset=True)
+            assert mock_embed_documents.call_count == 2, "Expected reset to re-embed"
+        
+        assert vectorstore._collection.count() == 3, "Expected no duplicate chunks"
+
+    def test_persisted_collection_is_rebuilt_when_content_changes(self, tmp_path):
+        """Tests FR-002: A stale persisted collection is rebuilt rather than reused.
+        
+        When the chunks' content fingerprint differs from the one stored on the
+        collection, reset=False must re-embed and replace (not append to) the chunks.
+        """
+        chunks = [
+            Document(page_content=f"Persisted chunk {i}", metadata={"source": f"{i}.md"})
+            for i in range(3)
+        ]
+        config = DataManagerConfig(db_name="test_stale", persist_dir=str(tmp_path))
+        embeddings = DeterministicFakeEmbedding(size=16)
+        
+        first = DataManager(config=config)
+        with patch.object(first, "get_embeddings", return_value=embeddings):
+            first.create_vectorstore(chunks=chunks, reset=True)
+        
+        changed = chunks[:2] + [Document(page_content="Edited chunk", metadata={"source": "2.md"})]
+        second = DataManager(config=config)
+        with patch.object(second, "get_embeddings", return_value=embeddings):
+            vectorstore = second.create_vectorstore(chunks=changed, reset=False)
+        
+        stored = sorted(vectorstore.get()["documents"])
+        assert stored == sorted(c.page_content for c in changed), (
+            f"Expected the collection to hold exactly the changed chunks, got: {stored}"
+        )
+
+
 class TestProcessDocuments:
     """Tests for DataManager.process_documents() method.
     
@@ -199,3 +419,319 @@ class TestProcessDocuments:
         assert "https://github.com/user/repo/blob/main/docs/guide.md#installation" in processed_content, (
             f"Expected anchor preserved in URL in: {processed_content}"
         )
+
+
+class TestChunkDocuments:
+    """Tests for DataManager.chunk_documents() method.
+    
+    Implements FR-002 (Knowledge Retrieval): Header-aware chunking of documents.
+    """
+
+    def test_chunk_documents_splits_headers_and_oversized_sections(self):
+        """Tests FR-002: Chunks carry header metadata and sequential chunk indices.
+        
+        Sections are split on h1-h3 headers, sections larger than chunk_size are split
+        further, and every chunk keeps its source metadata plus a global chunk_index.
+        """
+        long_section = " ".join(["word"] * 200)  # ~1000 characters
+        doc = Document(
+            page_content=(
+                "# Title\nIntro text.\n\n## Short\nA short section.\n\n"
+                f"## Long\n{long_section}\n"
+            ),
+            metadata={"source": "local://docs/about.md"},
+        )
+        
+        dm = DataManager(config=DataManagerConfig(chunk_size=300))
+        chunks = dm.chunk_documents([doc])
+        
+        assert len(chunks) > 3, "Expected the long section to be split by size"
+        assert [c.metadata["chunk_index"] for c in chunks] == list(range(len(chunks))), (
+            "Expected sequential chunk indices"
+        )
+        assert all(c.metadata["source"] == "local://docs/about.md" for c in chunks), (
+            "Expected source metadata on every chunk"
+        )
+        assert all(len(c.page_content) <= 300 for c in chunks), (
+            "Expected every chunk to respect chunk_size"
+        )
+        short = [c for c in chunks if c.metadata.get("H2") == "Short"]
+        assert len(short) == 1 and short[0].metadata["H1"] == "Title", (
+            f"Expected header metadata on the short section, got: {short}"
+        )
+        assert short[0].page_content.startswith("## Short"), "Headers should not be stripped"
+
+    def test_chunk_documents_shares_repeated_metadata_strings(self):
+        """Tests FR-002: Repeated header and file-name strings are shared between chunks."""
+        docs = [
+            Document(page_content=f"# Overview\nPart {i}.", metadata={"source": f"{i}/README.md"})
+            for i in range(2)
+        ]
+        
+        first, second = DataManager(config=DataManagerConfig()).chunk_documents(docs)
+        
+        assert first.metadata["H1"] is second.metadata["H1"], "Expected an interned header"
+        assert first.metadata["basename"] is second.metadata["basename"], (
+            "Expected an interned basename"
+        )
+
+    def test_chunk_documents_process_pool_matches_serial(self):
+        """Tests FR-002: Splitting across worker processes yields the same ordered chunks."""
+        test_data_dir = str(Path(__file__).parent.parent / "data")
+        docs = DataManager(config=DataManagerConfig(doc_root=test_data_dir)).load_local_documents()
+
+        serial = DataManager(config=DataManagerConfig(chunk_size=300)).chunk_documents(docs)
+        pooled = DataManager(
+            config=DataManagerConfig(chunk_size=300, chunk_processes=2)
+        ).chunk_documents(docs)
+
+        assert [(c.page_content, c.metadata) for c in pooled] == [
+            (c.page_content, c.metadata) for c in serial
+        ], "Expected process-pool chunking to match in-process chunking"
+
+
+class TestGetEmbeddings:
+    """Tests for DataManager.get_embeddings() method.
+    
+    Implements FR-002 (Knowledge Retrieval): Embedding model setup and caching.
+    """
+
+    def test_embedding_model_loaded_once_per_process(self):
+        """Tests FR-002: DataManagers with the same settings share one loaded model."""
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            config = DataManagerConfig(query_cache_size=0)
+            first = DataManager(config=config).get_embeddings()
+            second = DataManager(config=config).get_embeddings()
+            DataManager(config=DataManagerConfig(embedding_batch_size=7)).get_embeddings()
+        
+        assert first is second, "Expected the cached model to be reused"
+        assert mock_hf.call_count == 2, "Expected one load per distinct model setting"
+
+    def test_embedding_cache_skips_already_embedded_text(self, tmp_path):
+        """Tests FR-002: Cached chunk embeddings are reused across DataManagers.
+        
+        With embedding_cache_dir set, text embedded once must not be sent to the
+        underlying model again, even from a fresh DataManager instance.
+        """
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            mock_hf.return_value.embed_documents.side_effect = (
+                lambda texts: [[float(len(t)), 1.0] for t in texts]
+            )
+            config = DataManagerConfig(embedding_cache_dir=str(tmp_path))
+            
+            first = DataManager(config=config).get_embeddings()
+            assert first.embed_documents(["alpha", "beta"]) == [[5.0, 1.0], [4.0, 1.0]]
+            
+            second = DataManager(config=config).get_embeddings()
+            assert second.embed_documents(["alpha", "gamma"]) == [[5.0, 1.0], [5.0, 1.0]]
+        
+        embedded = [call.args[0] for call in mock_hf.return_value.embed_documents.call_args_list]
+        assert embedded == [["alpha", "beta"], ["gamma"]], (
+            f"Expected only uncached text to be embedded, got: {embedded}"
+        )
+
+    def test_embedding_cache_not_shared_across_model_setups(self, tmp_path):
+        """Tests FR-002: Cached vectors from one model setup are never served to another.
+
+        The same model name run through an ONNX export produces different vectors, so it
+        must miss the cache entries written by the PyTorch model, and persisted
+        collections must not match either.
+        """
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            mock_hf.return_value.embed_documents.side_effect = (
+                lambda texts: [[float(len(t)), 1.0] for t in texts]
+            )
+            torch_dm = DataManager(config=DataManagerConfig(embedding_cache_dir=str(tmp_path)))
+            onnx_dm = DataManager(config=DataManagerConfig(
+                embedding_cache_dir=str(tmp_path), embedding_onnx_file="onnx/model.onnx"
+            ))
+            torch_dm.get_embeddings().embed_documents(["alpha"])
+            onnx_dm.get_embeddings().embed_documents(["alpha"])
+
+        assert mock_hf.return_value.embed_documents.call_count == 2, (
+            "Expected the ONNX setup to miss the PyTorch setup's cache entries"
+        )
+        assert torch_dm._model_identity() != onnx_dm._model_identity()
+
+    def test_repeated_queries_are_embedded_once(self):
+        """Tests FR-002: Identical retrieval queries reuse the cached query embedding."""
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            mock_hf.return_value.embed_query.side_effect = lambda text: [float(len(text))]
+            embeddings = DataManager(config=DataManagerConfig()).get_embeddings()
+            
+            assert embeddings.embed_query("What is IT-245?") == [15.0]
+            assert embeddings.embed_query("What is IT-245?") == [15.0]
+            assert embeddings.embed_query("Who is Carol?") == [13.0]
+        
+        assert mock_hf.return_value.embed_query.call_count == 2, (
+            "Expected the repeated query to be served from cache"
+        )
+
+    def test_onnx_file_loads_model_with_onnx_backend(self):
+        """Tests FR-002: embedding_onnx_file runs the quantized ONNX export, not PyTorch."""
+        config = DataManagerConfig(
+            embedding_onnx_file="onnx/model_qint8_avx512_vnni.onnx", query_cache_size=0
+        )
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            DataManager(config=config).get_embeddings()
+        
+        model_kwargs = mock_hf.call_args.kwargs["model_kwargs"]
+        assert model_kwargs["backend"] == "onnx", f"Got model_kwargs: {model_kwargs}"
+        assert model_kwargs["model_kwargs"] == {
+            "file_name": "onnx/model_qint8_avx512_vnni.onnx"
+        }
+
+    def test_gpu_loads_bf16_model_and_pools_in_fp32(self):
+        """Tests FR-002: bf16-capable GPUs load bf16 weights with fp32 pooling."""
+        import torch
+        
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf, \
+                patch("torch.cuda.is_available", return_value=True), \
+                patch("torch.cuda.is_bf16_supported", return_value=True):
+            DataManager(config=DataManagerConfig(query_cache_size=0)).get_embeddings()
+        
+        model_kwargs = mock_hf.call_args.kwargs["model_kwargs"]
+        assert model_kwargs["model_kwargs"]["torch_dtype"] == torch.bfloat16, (
+            f"Got model_kwargs: {model_kwargs}"
+        )
+        mock_hf.return_value._client[0].register_forward_hook.assert_called_once()
+
+    def test_infinity_backend_uses_configured_server(self):
+        """Tests FR-002: The infinity backend talks to the configured server, not torch."""
+        from langchain_community.embeddings import InfinityEmbeddings
+        
+        config = DataManagerConfig(
+            embedding_backend="infinity",
+            infinity_api_url="http://embeddings:7997",
+            query_cache_size=0,
+        )
+        with patch("data.HuggingFaceEmbeddings") as mock_hf:
+            embeddings = DataManager(config=config).get_embeddings()
+        
+        mock_hf.assert_not_called()
+        assert isinstance(embeddings, InfinityEmbeddings), f"Got {type(embeddings)}"
+        assert embeddings.infinity_api_url == "http://embeddings:7997"
+
+    def test_multi_process_pool_started_once_per_vectorstore_build(self):
+        """Tests FR-002: Multi-process embedding reuses one pool for every insert batch.
+
+        The pool must be started once, used with the configured batch size and
+        normalization, stopped after the build, and never used for queries.
+        """
+        chunks = [
+            Document(page_content=f"Document number {i}", metadata={"source": f"doc{i}.md"})
+            for i in range(5)
+        ]
+        config = DataManagerConfig(
+            db_name="test_pool", embedding_multi_process=True, embedding_batch_size=8,
+            insert_batch_size=2,
+        )
+        with patch("data._MODEL_CACHE", {}), patch("data.HuggingFaceEmbeddings") as mock_hf:
+            client = mock_hf.return_value._client
+            client.encode.side_effect = lambda texts, **kwargs: MagicMock(
+                tolist=lambda: [[float(len(t)), 1.0] for t in texts]
+            )
+            dm = DataManager(config=config)
+            dm.create_vectorstore(chunks=chunks, reset=True)
+            dm.get_embeddings().embed_query("Document number 3")
+
+        assert mock_hf.call_args.kwargs.get("multi_process", False) is False
+        client.start_multi_process_pool.assert_called_once()
+        client.stop_multi_process_pool.assert_called_once_with(
+            client.start_multi_process_pool.return_value
+        )
+        assert client.encode.call_count == 3, "Expected one pooled encode per batch"
+        for call in client.encode.call_args_list:
+            assert call.kwargs["pool"] is client.start_multi_process_pool.return_value
+            assert call.kwargs["batch_size"] == 8
+            assert call.kwargs["normalize_embeddings"] is True
+        mock_hf.return_value.embed_query.assert_called_once_with("Document number 3")
+
+
+class TestLoadGithubDocuments:
+    """Tests for DataManager GitHub repo loading.
+    
+    Implements FR-002 (Knowledge Retrieval), FR-010 (Optional Tools - GitHub):
+    Loading markdown from cloned repositories.
+    """
+
+    def test_existing_clone_is_updated_instead_of_recloned(self, tmp_path):
+        """Tests FR-002: An existing clone is fetched and reset rather than re-cloned.
+        
+        Uses a local git repo as 'origin' so no network access is needed; new commits
+        on origin must show up in the loaded documents.
+        """
+        from git import Repo
+        
+        origin_path = tmp_path / "origin"
+        origin = Repo.init(origin_path, initial_branch="main")
+        (origin_path / "notes.md").write_text("# Notes\nFirst version\n")
+        origin.index.add(["notes.md"])
+        origin.index.commit("initial")
+        
+        tmp_dir = tmp_path / "tmp"
+        Repo.clone_from(f"file://{origin_path}", tmp_dir / "owner" / "repo", branch="main")
+        
+        (origin_path / "notes.md").write_text("# Notes\nSecond version\n")
+        origin.index.add(["notes.md"])
+        origin.index.commit("update")
+        
+        dm = DataManager(config=DataManagerConfig())
+        with patch("data.GitRepo.clone_from") as mock_clone_from:
+            docs = dm._load_github_repo("owner/repo", str(tmp_dir), lambda fp: True)
+        
+        mock_clone_from.assert_not_called()
+        assert len(docs) == 1, f"Expected one markdown document, got: {docs}"
+        assert "Second version" in docs[0].page_content, "Expected clone to be updated"
+        assert docs[0].metadata["github_repo"] == "owner/repo"
+
+    def test_github_docs_load_alongside_local_docs_in_order(self):
+        """Tests FR-002: GitHub docs load in the background and follow local docs.
+        
+        load_and_process_all overlaps GitHub loading with local loading, but the
+        combined list must keep local documents first so chunk indices are stable.
+        """
+        test_data_dir = str(Path(__file__).parent.parent / "data")
+        dm = DataManager(config=DataManagerConfig(doc_root=test_data_dir))
+        github_doc = Document(
+            page_content="# Remote\nFrom GitHub",
+            metadata={"source": "remote.md", "github_repo": "owner/repo"},
+        )
+        
+        with patch.object(dm, "_load_github_documents", return_value=[github_doc]) as mock_load:
+            chunks = dm.load_and_process_all(github_repos=["owner/repo"])
+        
+        mock_load.assert_called_once_with(repos=["owner/repo"])
+        assert chunks[-1].metadata["source"] == "remote.md", "Expected GitHub docs last"
+        assert all(c.metadata["source"] != "remote.md" for c in chunks[:-1])
+
+    def test_fresh_clone_checks_out_markdown_only(self, tmp_path):
+        """Tests FR-002: New clones are blobless and sparse, checking out only markdown.
+        
+        The GitHub URL is redirected to a local origin so no network access is needed.
+        """
+        from git import Repo
+        
+        origin_path = tmp_path / "origin"
+        origin = Repo.init(origin_path, initial_branch="main")
+        origin.git.config("uploadpack.allowFilter", "true")
+        (origin_path / "docs").mkdir()
+        (origin_path / "docs" / "notes.md").write_text("# Notes\nKept\n")
+        (origin_path / "main.py").write_text("print('skipped')\n")
+        origin.index.add(["docs/notes.md", "main.py"])
+        origin.index.commit("initial")
+        
+        clone_from = Repo.clone_from
+        dm = DataManager(config=DataManagerConfig())
+        with patch(
+            "data.GitRepo.clone_from",
+            side_effect=lambda url, path, **kwargs: clone_from(
+                f"file://{origin_path}", path, **kwargs
+            ),
+        ):
+            docs = dm._load_github_repo("owner/repo", str(tmp_path / "tmp"), lambda fp: True)
+        
+        repo_path = tmp_path / "tmp" / "owner" / "repo"
+        assert (repo_path / "docs" / "notes.md").exists(), "Expected markdown checked out"
+        assert not (repo_path / "main.py").exists(), "Expected non-markdown files skipped"
+        assert [doc.page_content for doc in docs] == ["# Notes\nKept\n"]